@@ -0,0 +1,250 @@
+"""Archive tier for completed tickets.
+
+Tickets with status ``done`` are moved out of the active ticket directory into
+compressed zip packs. A manifest next to the packs records, per ticket, the
+pack and member holding it plus pre-computed header metadata, and keeps
+aggregate counts so reports never open a pack. Individual tickets stay
+readable by id: a zip's central directory gives random access to one member.
+
+    python archive.py                    # archive every done ticket
+    python archive.py --dry-run
+    python archive.py --show NSA-2025-001
+"""
+import io
+import json
+import os
+import zipfile
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ticket_index import TicketIndex, get_index
+from ticket_stream import read_ticket
+
+MANIFEST_NAME = ".archive-manifest.json"
+
+# Statuses that mean a ticket will never be worked again
+ARCHIVABLE_STATUSES = frozenset(("done",))
+
+# Header fields copied into the manifest for each archived ticket
+MANIFEST_FIELDS = ("title", "type", "priority", "status", "assigned_to", "created")
+
+# Aggregates kept in the manifest, e.g. counts["status"]["done"]
+COUNTED_FIELDS = ("status", "priority", "type")
+
+class TicketArchive:
+    """Compressed packs of completed tickets with a metadata manifest.
+
+    Packs are written once and never modified. A ticket is first written to
+    a new pack, then recorded in the manifest, and only then deleted from the
+    active directory, so an interrupted run can leave a duplicate but never
+    loses a ticket.
+    """
+
+    def __init__(self, archive_dir="archived"):
+        self.archive_dir = Path(archive_dir)
+        self.manifest_path = self.archive_dir / MANIFEST_NAME
+        self.tickets: Dict[str, dict] = {}  # id -> {"pack", "member", metadata...}
+        self.packs: Dict[str, dict] = {}    # pack name -> {"created", "count"}
+        self.counts: Dict[str, Counter] = {field: Counter() for field in COUNTED_FIELDS}
+        self.manifest_mtime = None
+        self._open_packs: Dict[str, zipfile.ZipFile] = {}
+        self.load()
+
+    def load(self) -> bool:
+        """Load the manifest, returning False if there is none"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        self.tickets = manifest.get("tickets", {})
+        self.packs = manifest.get("packs", {})
+        counts = manifest.get("counts", {})
+        self.counts = {field: Counter(counts.get(field, {})) for field in COUNTED_FIELDS}
+        self.manifest_mtime = mtime
+        return True
+
+    def refresh(self) -> bool:
+        """Reload the manifest if another process has rewritten it since we loaded it"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except OSError:
+            return False
+        return mtime != self.manifest_mtime and self.load()
+
+    def save(self):
+        """Persist the manifest atomically"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "packs": self.packs,
+                "counts": {field: dict(counter) for field, counter in self.counts.items()},
+                "tickets": self.tickets
+            }, f, indent=0)
+        os.replace(tmp_path, self.manifest_path)
+        self.manifest_mtime = self.manifest_path.stat().st_mtime
+
+    def __contains__(self, ticket_id: str) -> bool:
+        if ticket_id in self.tickets:
+            return True
+        return self.refresh() and ticket_id in self.tickets
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+    def metadata(self, ticket_id: str) -> Optional[dict]:
+        """Manifest metadata for an archived ticket, without opening its pack"""
+        return self.tickets.get(ticket_id)
+
+    def new_pack_name(self) -> str:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        name = f"pack-{stamp}.zip"
+        suffix = 1
+        while name in self.packs or (self.archive_dir / name).exists():
+            suffix += 1
+            name = f"pack-{stamp}-{suffix}.zip"
+        return name
+
+    def add_pack(self, ticket_paths: Dict[str, Path]) -> str:
+        """Write tickets (id -> file) to a new pack and record them in the manifest"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        name = self.new_pack_name()
+        tmp_path = self.archive_dir / (name + ".tmp")
+        entries = {}
+
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as pack:
+            for ticket_id, path in ticket_paths.items():
+                member = f"{ticket_id}.xml"
+                pack.write(path, member)
+                ticket = read_ticket(path, include_progress=False, read_tags=False)
+                entry = {field: ticket[field] for field in MANIFEST_FIELDS}
+                entry.update({"pack": name, "member": member, "source": Path(path).name})
+                entries[ticket_id] = entry
+        os.replace(tmp_path, self.archive_dir / name)
+
+        for ticket_id, entry in entries.items():
+            previous = self.tickets.get(ticket_id)
+            if previous:
+                self.count(previous, -1)
+            self.tickets[ticket_id] = entry
+            self.count(entry, 1)
+        self.packs[name] = {"created": datetime.now().isoformat(), "count": len(entries)}
+        self.save()
+        return name
+
+    def count(self, entry: dict, delta: int):
+        for field in COUNTED_FIELDS:
+            value = entry.get(field) or "unknown"
+            self.counts[field][value] += delta
+            if self.counts[field][value] <= 0:
+                del self.counts[field][value]
+
+    def pack(self, name: str) -> zipfile.ZipFile:
+        """Open a pack for reading, reusing the handle across lookups"""
+        if name not in self._open_packs:
+            self._open_packs[name] = zipfile.ZipFile(self.archive_dir / name)
+        return self._open_packs[name]
+
+    def read_bytes(self, ticket_id: str) -> Optional[bytes]:
+        """Raw XML of an archived ticket"""
+        if ticket_id not in self:
+            return None
+        entry = self.tickets[ticket_id]
+        return self.pack(entry["pack"]).read(entry["member"])
+
+    def read_ticket(self, ticket_id: str, **kwargs) -> Optional[dict]:
+        """Stream-parse an archived ticket, see ticket_stream.read_ticket"""
+        data = self.read_bytes(ticket_id)
+        if data is None:
+            return None
+        return read_ticket(io.BytesIO(data), **kwargs)
+
+    def summary(self) -> dict:
+        """Archived ticket counts from the manifest"""
+        self.refresh()
+        return {
+            "archived": len(self.tickets),
+            "packs": len(self.packs),
+            "by_status": dict(self.counts["status"]),
+            "by_priority": dict(self.counts["priority"]),
+            "by_type": dict(self.counts["type"])
+        }
+
+    def close(self):
+        for pack in self._open_packs.values():
+            pack.close()
+        self._open_packs.clear()
+
+def find_archivable(index: TicketIndex,
+                    statuses: Iterable[str] = ARCHIVABLE_STATUSES) -> Dict[str, Path]:
+    """Active tickets whose status means they are finished"""
+    statuses = frozenset(statuses)
+    found = {}
+    for path in index.scan():
+        try:
+            ticket = read_ticket(path, include_progress=False, read_tags=False)
+        except Exception as e:
+            print(f"Skipping {path.name}: {e}")
+            continue
+        if ticket["id"] and ticket["status"] in statuses:
+            found[ticket["id"]] = path
+    return found
+
+def archive_tickets(ticket_dir="active/development", archive_dir="archived",
+                    pack_size: int = 500, dry_run: bool = False) -> List[str]:
+    """Move finished tickets from a ticket directory into archive packs"""
+    index = get_index(ticket_dir)
+    archive = TicketArchive(archive_dir)
+    candidates = find_archivable(index)
+    if dry_run or not candidates:
+        return sorted(candidates)
+
+    ids = sorted(candidates)
+    for start in range(0, len(ids), pack_size):
+        chunk = {ticket_id: candidates[ticket_id] for ticket_id in ids[start:start + pack_size]}
+        name = archive.add_pack(chunk)
+        print(f"Archived {len(chunk)} tickets to {name}")
+        # Only drop the active copies once the pack and manifest are on disk
+        for ticket_id, path in chunk.items():
+            path.unlink(missing_ok=True)
+            index.remove(ticket_id, save=False)
+        index.save()
+
+    archive.close()
+    return ids
+
+# One archive per directory per process
+_archives: Dict[str, TicketArchive] = {}
+
+def get_archive(archive_dir="archived") -> TicketArchive:
+    """Get the shared archive for a directory"""
+    key = str(Path(archive_dir).resolve())
+    if key not in _archives:
+        _archives[key] = TicketArchive(archive_dir)
+    return _archives[key]
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move done tickets into compressed archive packs")
+    parser.add_argument("--ticket-dir", default="active/development")
+    parser.add_argument("--archive-dir", default="archived")
+    parser.add_argument("--pack-size", type=int, default=500, help="Maximum tickets per pack")
+    parser.add_argument("--dry-run", action="store_true", help="List tickets that would be archived")
+    parser.add_argument("--show", metavar="TICKET_ID", help="Print an archived ticket's XML")
+    args = parser.parse_args()
+
+    if args.show:
+        data = TicketArchive(args.archive_dir).read_bytes(args.show)
+        if data is None:
+            parser.exit(1, f"Ticket not archived: {args.show}\n")
+        print(data.decode("utf-8"))
+    else:
+        ids = archive_tickets(args.ticket_dir, args.archive_dir, args.pack_size, args.dry_run)
+        verb = "Would archive" if args.dry_run else "Archived"
+        print(f"{verb} {len(ids)} tickets")
@@ -1,17 +1,38 @@
 import asyncio
+import copy
 import json
 import argparse
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-import xml.etree.ElementTree as ET
+from typing import Dict, Any, Iterable, List, Optional
 from pathlib import Path
-from datetime import datetime
+from archive import get_archive
+from ticket_index import TicketIndex, get_index
+from ticket_stream import agent_update_type, append_update, read_ticket
+
+def agent_ticket_data(ticket: dict) -> dict:
+    """Ticket data as passed to process_ticket, from a ticket_stream.read_ticket result"""
+    return {
+        "id": ticket["id"] or "Unknown",
+        "title": ticket["title"] or "No Title",
+        "description": ticket["description"] or "",
+        "priority": ticket["priority"] or "medium",
+        "status": ticket["status"] or "open",
+        "requirements": ticket["requirements"],
+        "dependencies": ticket["dependencies"],
+        "tags": ticket["tags"]
+    }
 
 class BaseAgent(ABC):
+    # Index of active tickets; the dispatcher sets its own on in-process agents
+    ticket_index: Optional[TicketIndex] = None
+
     def __init__(self, agent_type: str):
         self.agent_type = agent_type
         self.ticket_id = None
         self.ticket_data = None
+        # Parsed tickets, shared by every ticket handled in a batch
+        self.ticket_cache: Dict[str, dict] = {}
 
     @abstractmethod
     async def process_ticket(self, ticket_data: dict) -> Dict[str, Any]:
@@ -20,6 +41,11 @@ class BaseAgent(ABC):
 
     async def run(self, ticket_id: str):
         """Main agent execution method"""
+        output = await self.process(ticket_id)
+        print(json.dumps(output))
+
+    async def process(self, ticket_id: str) -> Dict[str, Any]:
+        """Load and process one ticket, returning the structured result"""
         self.ticket_id = ticket_id
         
         # Load ticket data
@@ -29,147 +55,90 @@ class BaseAgent(ABC):
         result = await self.process_ticket(self.ticket_data)
         
         # Return structured result
-        output = {
+        return {
             "agent_type": self.agent_type,
             "ticket_id": ticket_id,
             "status": "completed",
             "output": result,
             "timestamp": asyncio.get_event_loop().time()
         }
+
+    async def run_batch(self, ticket_ids: Iterable[str], concurrency: int = 4):
+        """Process many tickets in one event loop, printing one JSON line per ticket as it finishes"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def process_one(ticket_id: str):
+            # Each ticket gets its own view of the agent; loaded state and the
+            # ticket cache are shared through the shallow copy
+            agent = copy.copy(self)
+            async with semaphore:
+                try:
+                    output = await agent.process(ticket_id)
+                except Exception as e:
+                    output = {
+                        "agent_type": self.agent_type,
+                        "ticket_id": ticket_id,
+                        "status": "failed",
+                        "output": {"error": str(e)},
+                        "timestamp": asyncio.get_event_loop().time()
+                    }
+            print(json.dumps(output), flush=True)
         
-        print(json.dumps(output))
+        await asyncio.gather(*(process_one(ticket_id) for ticket_id in dict.fromkeys(ticket_ids)))
+
+    @classmethod
+    def main(cls, argv: Optional[List[str]] = None):
+        """Command line entry point for agent scripts: one ticket or a batch"""
+        args = parse_agent_args(argv)
+        ticket_ids = collect_ticket_ids(args)
+        agent = cls()
+        
+        if len(ticket_ids) == 1 and not args.batch:
+            asyncio.run(agent.run(ticket_ids[0]))
+        else:
+            asyncio.run(agent.run_batch(ticket_ids, args.concurrency))
 
     def load_ticket_data(self, ticket_id: str) -> dict:
         """Load ticket XML and parse into structured data"""
-        # Find the actual ticket file (filename may include title)
-        ticket_dir = Path(__file__).parent / "active/development"
-        ticket_files = list(ticket_dir.glob(f"{ticket_id}*.xml"))
-        
-        if not ticket_files:
+        if ticket_id in self.ticket_cache:
+            return self.ticket_cache[ticket_id]
+        
+        # Done tickets live in the archive packs; checking the manifest first
+        # keeps them from sending the active index into a rescan
+        archive = get_archive(Path(__file__).parent / "archived")
+        if ticket_id in archive:
+            ticket = archive.read_ticket(ticket_id, include_progress=False)
+        else:
+            # Find the actual ticket file (filename may include title)
+            ticket_path = self.active_index().lookup(ticket_id)
+            
+            # Stream the headers; the progress history is never loaded
+            ticket = None if ticket_path is None else read_ticket(ticket_path, include_progress=False)
+        
+        if ticket is None:
             raise FileNotFoundError(f"Ticket file not found for ID: {ticket_id}")
         
-        ticket_path = ticket_files[0]  # Use the first matching file
-        
-        tree = ET.parse(ticket_path)
-        root = tree.getroot()
-        
-        # Try different namespaces
-        namespaces = [
-            {'ns': 'http://nsa.ca/ticket-system'},
-            {'ns': 'https://nsa-images.org/schemas/ticket/v1.0'},
-            {'ns0': 'https://nsa-images.org/schemas/ticket/v1.0'},
-            {}  # No namespace
-        ]
-        
-        for ns in namespaces:
-            try:
-                # Try to find elements with current namespace
-                if 'ns0' in ns:
-                    id_elem = root.find(".//ns0:id", ns)
-                    title_elem = root.find(".//ns0:title", ns)
-                    description_elem = root.find(".//ns0:description", ns)
-                    priority_elem = root.find(".//ns0:priority", ns)
-                    status_elem = root.find(".//ns0:status", ns)
-                else:
-                    id_elem = root.find(".//ns:id", ns) if ns else root.find(".//id")
-                    title_elem = root.find(".//ns:title", ns) if ns else root.find(".//title")
-                    description_elem = root.find(".//ns:description", ns) if ns else root.find(".//description")
-                    priority_elem = root.find(".//ns:priority", ns) if ns else root.find(".//priority")
-                    status_elem = root.find(".//ns:status", ns) if ns else root.find(".//status")
-                
-                if id_elem is not None:
-                    return {
-                        "id": id_elem.text,
-                        "title": title_elem.text if title_elem is not None else "No Title",
-                        "description": description_elem.text if description_elem is not None else "",
-                        "priority": priority_elem.text if priority_elem is not None else "medium",
-                        "status": status_elem.text if status_elem is not None else "open",
-                        "requirements": self.parse_requirements(root, ns),
-                        "dependencies": self.parse_dependencies(root, ns),
-                        "tags": [tag.text for tag in (root.findall(".//ns:tag", ns) if ns else root.findall(".//tag"))]
-                    }
-            except Exception:
-                continue
-        
-        # If no namespace worked, try without namespace
-        return {
-            "id": root.find(".//id").text if root.find(".//id") is not None else "Unknown",
-            "title": root.find(".//title").text if root.find(".//title") is not None else "No Title",
-            "description": root.find(".//description").text if root.find(".//description") is not None else "",
-            "priority": root.find(".//priority").text if root.find(".//priority") is not None else "medium",
-            "status": root.find(".//status").text if root.find(".//status") is not None else "open",
-            "requirements": self.parse_requirements(root),
-            "dependencies": self.parse_dependencies(root),
-            "tags": [tag.text for tag in root.findall(".//tag")]
-        }
+        ticket_data = agent_ticket_data(ticket)
+        self.ticket_cache[ticket_id] = ticket_data
+        return ticket_data
 
-    def parse_requirements(self, root, ns=None) -> dict:
-        """Parse requirements section from ticket XML"""
-        requirements = {}
-        if ns is None:
-            ns = {'ns': 'http://nsa.ca/ticket-system'}
-        
-        req_section = root.find(".//ns:requirements", ns)
-        
-        if req_section is not None:
-            for req_type in ["functional", "technical", "non_functional"]:
-                req_elem = req_section.find(f"ns:{req_type}", ns)
-                if req_elem is not None:
-                    requirements[req_type] = [
-                        req.get("id") for req in req_elem.findall("ns:requirement", ns)
-                    ]
-        
-        return requirements
-
-    def parse_dependencies(self, root, ns=None) -> list:
-        """Parse dependencies from ticket XML"""
-        deps = []
-        if ns is None:
-            ns = {'ns': 'http://nsa.ca/ticket-system'}
-        
-        deps_section = root.find(".//ns:dependencies", ns)
-        
-        if deps_section is not None:
-            for dep in deps_section.findall("ns:dependency", ns):
-                deps.append({
-                    "id": dep.get("id"),
-                    "type": dep.get("type"),
-                    "description": dep.text
-                })
-        
-        return deps
+    def active_index(self) -> TicketIndex:
+        """Index of the active ticket directory next to this module, unless one was set"""
+        if self.ticket_index is not None:
+            return self.ticket_index
+        return get_index(Path(__file__).parent / "active/development")
 
     def update_ticket_progress(self, status: str, details: str):
         """Update ticket with progress information"""
         # Find the actual ticket file (filename may include title)
-        ticket_dir = Path("tools/ticket-system/active/development")
-        ticket_files = list(ticket_dir.glob(f"{self.ticket_id}*.xml"))
+        ticket_path = self.active_index().lookup(self.ticket_id)
         
-        if not ticket_files:
+        if ticket_path is None:
             print(f"Warning: Ticket file not found for progress update: {self.ticket_id}")
             return
         
-        ticket_path = ticket_files[0]  # Use the first matching file
-        
-        tree = ET.parse(ticket_path)
-        root = tree.getroot()
-        
-        # Add progress update
-        progress_elem = root.find(".//progress")
-        if progress_elem is None:
-            progress_elem = ET.SubElement(root, "progress")
-        
-        update_elem = ET.SubElement(progress_elem, "update")
-        update_elem.set("timestamp", datetime.now().isoformat())
-        update_elem.set("agent", self.agent_type)
-        
-        status_elem = ET.SubElement(update_elem, "status")
-        status_elem.text = status
-        
-        details_elem = ET.SubElement(update_elem, "details")
-        details_elem.text = details
-        
-        tree.write(ticket_path, encoding="UTF-8", xml_declaration=True)
+        # Progress goes to the communication log, where the schema allows it
+        append_update(ticket_path, self.agent_type, f"{status}: {details}", agent_update_type(status))
 
     def log_info(self, message: str):
         """Log informational message"""
@@ -183,11 +152,31 @@ class BaseAgent(ABC):
         """Log warning message"""
         print(f"[{self.agent_type}] WARNING: {message}")
 
-if __name__ == "__main__":
+def parse_agent_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the agent command line (shared by every agent script)"""
     parser = argparse.ArgumentParser()
-    parser.add_argument("--ticket-id", required=True, help="Ticket ID to process")
-    args = parser.parse_args()
-    
-    # This would be implemented by specific agents
-    # agent = SpecificAgent()
-    # asyncio.run(agent.run(args.ticket_id))
+    parser.add_argument("ticket_ids", nargs="*", help="Ticket IDs to process")
+    parser.add_argument("--ticket-id", action="append", default=[], help="Ticket ID to process (repeatable)")
+    parser.add_argument("--ticket-file", help="File with one ticket ID per line ('-' for stdin)")
+    parser.add_argument("--batch", action="store_true", help="Print one JSON line per ticket even for a single ticket")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tickets processed at once in batch mode")
+    args = parser.parse_args(argv)
+    if not (args.ticket_ids or args.ticket_id or args.ticket_file):
+        parser.error("at least one ticket ID is required")
+    return args
+
+def collect_ticket_ids(args: argparse.Namespace) -> List[str]:
+    """Gather ticket IDs from positional args, --ticket-id and --ticket-file"""
+    ticket_ids = list(args.ticket_ids) + list(args.ticket_id)
+    if args.ticket_file:
+        source = sys.stdin if args.ticket_file == "-" else open(args.ticket_file, encoding="utf-8")
+        with source:
+            ticket_ids.extend(line.strip() for line in source if line.strip())
+    return ticket_ids
+
+if __name__ == "__main__":
+    # This would be implemented by specific agents:
+    # class SpecificAgent(BaseAgent): ...
+    # if __name__ == "__main__":
+    #     SpecificAgent.main()
+    parse_agent_args()
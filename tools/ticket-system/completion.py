@@ -0,0 +1,96 @@
+import json
+from collections import Counter, deque
+from pathlib import Path
+from typing import Dict, Optional
+
+from task_store import TaskStatus, agent_types, wall_clock
+
+DEFAULT_LOG_PATH = Path(__file__).parent / ".cache" / "completed-tasks.jsonl"
+
+class CompletionLog:
+    """Bounded record of finished tasks.
+
+    Per ticket, the agent types scheduled and completed are kept as bitsets and
+    dropped once every scheduled task has finished. Aggregate counters cover
+    the dispatcher's lifetime, the last ``history_limit`` tasks are kept in
+    memory and every finished task is appended to a JSON lines log on disk.
+    """
+
+    def __init__(self, log_path: Optional[Path] = None, history_limit: int = 1000):
+        self.log_path = Path(log_path or DEFAULT_LOG_PATH)
+        self.scheduled: Dict[str, int] = {}  # ticket_id -> agent bitset
+        self.finished: Dict[str, int] = {}   # ticket_id -> agent bitset (completed or failed)
+        self.completed: Dict[str, int] = {}  # ticket_id -> agent bitset
+        self.counters = Counter()  # (agent_type, status) -> count
+        self.recent = deque(maxlen=history_limit)
+
+    def schedule(self, ticket_id: str, agent_type: str):
+        """Note that a ticket has a task for an agent type"""
+        self.scheduled[ticket_id] = self.scheduled.get(ticket_id, 0) | agent_types.bit(agent_type)
+
+    def record(self, task, agent_result: Optional[dict] = None):
+        """Fold a finished task into the bitsets and counters and spill it to disk"""
+        bit = task.agent_bit
+        ticket_id = task.ticket_id
+        self.counters[(task.agent_type, task.status.value)] += 1
+        self.finished[ticket_id] = self.finished.get(ticket_id, 0) | bit
+        if task.status == TaskStatus.COMPLETED:
+            self.completed[ticket_id] = self.completed.get(ticket_id, 0) | bit
+
+        record = {
+            "ticket_id": ticket_id,
+            "agent_type": task.agent_type,
+            "status": task.status.value,
+            "priority": task.priority,
+            "estimated_duration": task.estimated_duration,
+            "start_time": wall_clock(task.start_time),
+            "completion_time": wall_clock(task.completion_time),
+            "result_status": (agent_result or {}).get("status")
+        }
+        self.recent.append(record)
+        self.spill(record)
+
+        # Forget the ticket once all of its scheduled tasks have finished
+        scheduled = self.scheduled.get(ticket_id, 0)
+        if self.finished[ticket_id] & scheduled == scheduled:
+            self.scheduled.pop(ticket_id, None)
+            self.finished.pop(ticket_id, None)
+            self.completed.pop(ticket_id, None)
+
+    def spill(self, record: dict):
+        """Append a full task record to the on-disk log"""
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Warning: could not write completion log: {e}")
+
+    def dependencies_met(self, ticket_id: str, dependency_mask: int) -> bool:
+        """Check a task's dependencies against the other tasks of the same ticket.
+
+        A dependency on an agent type the ticket has no task for is met. Once a
+        ticket is forgotten all of its tasks are finished, so nothing can wait
+        on it.
+        """
+        pending = dependency_mask & self.scheduled.get(ticket_id, 0)
+        return pending & self.completed.get(ticket_id, 0) == pending
+
+    def dependencies_failed(self, ticket_id: str, dependency_mask: int) -> bool:
+        """Check whether a dependency finished without completing (failed or skipped)"""
+        pending = dependency_mask & self.scheduled.get(ticket_id, 0)
+        unsuccessful = self.finished.get(ticket_id, 0) & ~self.completed.get(ticket_id, 0)
+        return bool(pending & unsuccessful)
+
+    def total(self, status: str) -> int:
+        """Lifetime count of finished tasks with a status"""
+        return sum(count for (_, task_status), count in self.counters.items() if task_status == status)
+
+    def summary(self) -> dict:
+        return {
+            "completed": self.total("completed"),
+            "failed": self.total("failed"),
+            "skipped": self.total("skipped"),
+            "tracked_tickets": len(self.scheduled),
+            "retained_history": len(self.recent)
+        }
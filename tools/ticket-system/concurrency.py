@@ -0,0 +1,230 @@
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+class AdaptiveSemaphore:
+    """Semaphore whose limit can be changed while tasks hold or wait for it"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def resize(self, limit: int):
+        """Change the limit; tasks already running are never interrupted"""
+        self.limit = limit
+        self._wake()
+
+    def _wake(self):
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+@dataclass
+class PoolStats:
+    min_limit: int
+    max_limit: int
+    latency: Optional[float] = None  # EWMA seconds
+    baseline_latency: Optional[float] = None  # lowest EWMA in the recent window
+    failure_rate: float = 0.0  # EWMA
+    completed: int = 0
+    failed: int = 0
+    new_samples: int = 0  # tasks recorded since the last control step
+    last_decrease: Optional[float] = None  # controller clock
+    decision: str = "initial"
+    history: deque = field(default_factory=lambda: deque(maxlen=20))
+    recent_latencies: deque = field(default_factory=deque)
+
+def read_host_load() -> Dict[str, Optional[float]]:
+    """Read load average per CPU and available memory fraction from /proc"""
+    load = {"load_per_cpu": None, "mem_available": None}
+
+    try:
+        with open("/proc/loadavg") as f:
+            load["load_per_cpu"] = float(f.read().split()[0]) / (os.cpu_count() or 1)
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        meminfo = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                meminfo[key] = int(value.split()[0])
+        load["mem_available"] = meminfo["MemAvailable"] / meminfo["MemTotal"]
+    except (OSError, ValueError, KeyError, IndexError, ZeroDivisionError):
+        pass
+
+    return load
+
+class AdaptiveConcurrencyController:
+    """AIMD controller resizing agent pools from latency, failures and host load.
+
+    Each interval a pool's limit is multiplied by ``decrease_factor`` when the
+    host is overloaded, the pool's failure rate is high or its latency has
+    drifted well above its best observed latency; otherwise it grows by one
+    if the pool is saturated (tasks waiting for a slot).
+
+    The latency baseline is the minimum over the last ``baseline_window``
+    samples, so one unusually fast run is forgotten. Pool signals only count
+    when tasks finished since the previous step, and after a decrease the
+    pool is held for ``decrease_cooldown`` seconds so tasks started under the
+    new limit can report back.
+    """
+
+    def __init__(self, pools: Dict[str, AdaptiveSemaphore],
+                 bounds: Optional[Dict[str, Tuple[int, int]]] = None,
+                 interval: Optional[float] = 5.0, smoothing: float = 0.3,
+                 decrease_factor: float = 0.75, max_failure_rate: float = 0.25,
+                 latency_tolerance: float = 2.0, max_load_per_cpu: float = 1.0,
+                 min_mem_available: float = 0.1, baseline_window: int = 50,
+                 decrease_cooldown: float = 30.0, clock=time.monotonic):
+        self.pools = pools
+        self.bounds = bounds or {}
+        self.interval = interval
+        self.smoothing = smoothing
+        self.decrease_factor = decrease_factor
+        self.max_failure_rate = max_failure_rate
+        self.latency_tolerance = latency_tolerance
+        self.max_load_per_cpu = max_load_per_cpu
+        self.min_mem_available = min_mem_available
+        self.baseline_window = baseline_window
+        self.decrease_cooldown = decrease_cooldown
+        self.clock = clock
+        self.stats: Dict[str, PoolStats] = {}
+        self.host_load = read_host_load()
+
+        for name in pools:
+            self.track(name)
+
+    def track(self, name: str):
+        """Start tracking a pool (pools can be added after construction)"""
+        if name not in self.stats:
+            limit = self.pools[name].limit
+            min_limit, max_limit = self.bounds.get(name, (1, max(limit * 4, 4)))
+            self.stats[name] = PoolStats(min_limit=min_limit, max_limit=max_limit,
+                                         recent_latencies=deque(maxlen=self.baseline_window))
+
+    def record(self, name: str, latency: float, failed: bool):
+        """Record one finished task"""
+        stats = self.stats[name]
+        a = self.smoothing
+        stats.latency = latency if stats.latency is None else a * latency + (1 - a) * stats.latency
+        stats.recent_latencies.append(stats.latency)
+        stats.baseline_latency = min(stats.recent_latencies)
+        stats.failure_rate = a * float(failed) + (1 - a) * stats.failure_rate
+        stats.completed += 1
+        stats.failed += int(failed)
+        stats.new_samples += 1
+
+    def host_overloaded(self) -> Optional[str]:
+        """Return the reason the host is overloaded, if it is"""
+        load = self.host_load["load_per_cpu"]
+        if load is not None and load > self.max_load_per_cpu:
+            return f"host load {load:.2f}/cpu"
+        mem = self.host_load["mem_available"]
+        if mem is not None and mem < self.min_mem_available:
+            return f"host memory {mem:.0%} available"
+        return None
+
+    def adjust(self):
+        """Run one control step over every pool"""
+        self.host_load = read_host_load()
+        overloaded = self.host_overloaded()
+        now = self.clock()
+
+        for name, pool in self.pools.items():
+            self.track(name)
+            stats = self.stats[name]
+            limit = pool.limit
+            # Failure rate and latency only change when tasks finish
+            fresh = stats.new_samples > 0
+            stats.new_samples = 0
+
+            if overloaded:
+                reason = overloaded
+            elif fresh and stats.failure_rate > self.max_failure_rate:
+                reason = f"failure rate {stats.failure_rate:.0%}"
+            elif (fresh and stats.latency is not None and stats.baseline_latency
+                  and stats.latency > stats.baseline_latency * self.latency_tolerance):
+                reason = f"latency {stats.latency:.1f}s vs {stats.baseline_latency:.1f}s"
+            else:
+                reason = None
+
+            cooling = stats.last_decrease is not None and now - stats.last_decrease < self.decrease_cooldown
+            if reason and cooling:
+                new_limit = limit
+                decision = f"hold: cooldown ({reason})"
+            elif reason:
+                new_limit = int(limit * self.decrease_factor)
+                decision = f"decrease: {reason}"
+                stats.last_decrease = now
+            elif pool.waiting and pool.in_flight >= limit:
+                new_limit = limit + 1
+                decision = "increase: saturated"
+            else:
+                new_limit = limit
+                decision = "hold"
+
+            new_limit = max(stats.min_limit, min(stats.max_limit, new_limit))
+            if new_limit != limit:
+                pool.resize(new_limit)
+                stats.history.append((time.time(), limit, new_limit, decision))
+            stats.decision = decision
+
+    async def run(self):
+        """Adjust pools every interval until cancelled (never, if interval is None)"""
+        if self.interval is None:
+            return
+        while True:
+            await asyncio.sleep(self.interval)
+            self.adjust()
+
+    def summary(self) -> Dict[str, dict]:
+        """Current limits and the last decision for every pool"""
+        return {
+            name: {
+                "limit": pool.limit,
+                "in_flight": pool.in_flight,
+                "waiting": pool.waiting,
+                "bounds": [self.stats[name].min_limit, self.stats[name].max_limit],
+                "latency": self.stats[name].latency,
+                "failure_rate": round(self.stats[name].failure_rate, 3),
+                "decision": self.stats[name].decision
+            }
+            for name, pool in self.pools.items() if name in self.stats
+        }
@@ -2,12 +2,16 @@ import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from archive import get_archive
+from ticket_index import get_index
+from ticket_stream import read_ticket
 import time
 
 class TicketDashboard:
     def __init__(self):
         self.ticket_dir = Path("active/development")
+        # Done tickets are packed here; they are counted from its manifest, never parsed
+        self.archive = get_archive(Path("archived"))
 
     async def generate_dashboard(self):
         """Generate real-time dashboard data"""
@@ -25,115 +29,49 @@ class TicketDashboard:
         
         return dashboard_data
 
-    def load_all_tickets(self):
+    def load_all_tickets(self, progress_hours=24):
         """Load all ticket XML files"""
         tickets = []
         
         if not self.ticket_dir.exists():
             return tickets
         
-        for ticket_file in self.ticket_dir.glob("*.xml"):
+        # Only progress inside the recent-updates window is kept in memory
+        cutoff = datetime.now().timestamp() - (progress_hours * 3600) if progress_hours else None
+        
+        for ticket_file in get_index(self.ticket_dir).scan():
             if ticket_file.name != "README.md":
                 try:
-                    tree = ET.parse(ticket_file)
-                    root = tree.getroot()
-                    
-                    # Try different namespaces
-                    namespaces = [
-                        {'ns': 'http://nsa.ca/ticket-system'},
-                        {'ns': 'https://nsa-images.org/schemas/ticket/v1.0'},
-                        {'ns0': 'https://nsa-images.org/schemas/ticket/v1.0'},
-                        {}  # No namespace
-                    ]
-                    
-                    ticket_data = None
-                    for ns in namespaces:
-                        try:
-                            # Try to find elements with current namespace
-                            if 'ns0' in ns:
-                                id_elem = root.find(".//ns0:id", ns)
-                                title_elem = root.find(".//ns0:title", ns)
-                                type_elem = root.find(".//ns0:type", ns)
-                                priority_elem = root.find(".//ns0:priority", ns)
-                                status_elem = root.find(".//ns0:status", ns)
-                                assigned_to_elem = root.find(".//ns0:assigned_to", ns)
-                                created_elem = root.find(".//ns0:created", ns)
-                                tags_elem = root.findall(".//ns0:tag", ns)
-                            else:
-                                id_elem = root.find(".//ns:id", ns) if ns else root.find(".//id")
-                                title_elem = root.find(".//ns:title", ns) if ns else root.find(".//title")
-                                type_elem = root.find(".//ns:type", ns) if ns else root.find(".//type")
-                                priority_elem = root.find(".//ns:priority", ns) if ns else root.find(".//priority")
-                                status_elem = root.find(".//ns:status", ns) if ns else root.find(".//status")
-                                assigned_to_elem = root.find(".//ns:assigned_to", ns) if ns else root.find(".//assigned_to")
-                                created_elem = root.find(".//ns:created", ns) if ns else root.find(".//created")
-                                tags_elem = root.findall(".//ns:tag", ns) if ns else root.findall(".//tag")
-                            
-                            if id_elem is not None:
-                                ticket_data = {
-                                    "id": id_elem.text,
-                                    "title": title_elem.text if title_elem is not None else "No Title",
-                                    "type": type_elem.text if type_elem is not None else "Unknown",
-                                    "priority": priority_elem.text if priority_elem is not None else "medium",
-                                    "status": status_elem.text if status_elem is not None else "open",
-                                    "assigned_to": assigned_to_elem.text if assigned_to_elem is not None else "Unassigned",
-                                    "created": created_elem.text if created_elem is not None else "Unknown",
-                                    "tags": [tag.text for tag in tags_elem],
-                                    "progress": self.parse_progress(root, ns)
-                                }
-                                break
-                        except Exception:
-                            continue
-                    
-                    # If no namespace worked, try without namespace
-                    if ticket_data is None:
-                        ticket_data = {
-                            "id": root.find(".//id").text if root.find(".//id") is not None else "Unknown",
-                            "title": root.find(".//title").text if root.find(".//title") is not None else "No Title",
-                            "type": root.find(".//type").text if root.find(".//type") is not None else "Unknown",
-                            "priority": root.find(".//priority").text if root.find(".//priority") is not None else "medium",
-                            "status": root.find(".//status").text if root.find(".//status") is not None else "open",
-                            "assigned_to": root.find(".//assigned_to").text if root.find(".//assigned_to") is not None else "Unassigned",
-                            "created": root.find(".//created").text if root.find(".//created") is not None else "Unknown",
-                            "tags": [tag.text for tag in root.findall(".//tag")],
-                            "progress": self.parse_progress(root)
-                        }
+                    ticket = read_ticket(ticket_file, since=cutoff)
                     
-                    tickets.append(ticket_data)
+                    tickets.append({
+                        "id": ticket["id"] or "Unknown",
+                        "title": ticket["title"] or "No Title",
+                        "type": ticket["type"] or "Unknown",
+                        "priority": ticket["priority"] or "medium",
+                        "status": ticket["status"] or "open",
+                        "assigned_to": ticket["assigned_to"] or "Unassigned",
+                        "created": ticket["created"] or "Unknown",
+                        "tags": ticket["tags"],
+                        "progress": ticket["progress"]
+                    })
                 except Exception as e:
                     print(f"Error loading {ticket_file}: {e}")
         
         return tickets
 
-    def parse_progress(self, root, ns=None):
-        """Parse progress updates from ticket"""
-        progress = []
-        if ns is None:
-            ns = {'ns': 'http://nsa.ca/ticket-system'}
-        
-        progress_elem = root.find(".//ns:progress", ns)
-        
-        if progress_elem is not None:
-            for update in progress_elem.findall("ns:update", ns):
-                progress.append({
-                    "timestamp": update.get("timestamp"),
-                    "agent": update.get("agent"),
-                    "status": update.find("ns:status", ns).text if update.find("ns:status", ns) is not None else None,
-                    "details": update.find("ns:details", ns).text if update.find("ns:details", ns) is not None else None
-                })
-        
-        return progress
-
     def generate_summary(self, tickets):
         """Generate summary statistics"""
+        archived = self.archive.summary()
         return {
-            "total_tickets": len(tickets),
+            "total_tickets": len(tickets) + archived["archived"],
             "open_tickets": len([t for t in tickets if t["status"] == "open"]),
             "in_progress": len([t for t in tickets if t["status"] == "in-progress"]),
             "blocked": len([t for t in tickets if t["status"] == "blocked"]),
-            "completed": len([t for t in tickets if t["status"] == "done"]),
-            "critical": len([t for t in tickets if t["priority"] == "critical"]),
-            "high": len([t for t in tickets if t["priority"] == "high"])
+            "completed": len([t for t in tickets if t["status"] == "done"]) + archived["by_status"].get("done", 0),
+            "critical": len([t for t in tickets if t["priority"] == "critical"]) + archived["by_priority"].get("critical", 0),
+            "high": len([t for t in tickets if t["priority"] == "high"]) + archived["by_priority"].get("high", 0),
+            "archived": archived["archived"]
         }
 
     def group_by_team(self, tickets):
@@ -209,6 +147,8 @@ class TicketDashboard:
         print(f"   Total Tickets: {summary['total_tickets']}")
         print(f"   Open: {summary['open_tickets']} | In Progress: {summary['in_progress']} | Blocked: {summary['blocked']} | Completed: {summary['completed']}")
         print(f"   Critical: {summary['critical']} | High Priority: {summary['high']}")
+        if summary['archived']:
+            print(f"   Archived: {summary['archived']}")
         
         # By Status
         print(f"\n📋 BY STATUS")
@@ -1,50 +1,114 @@
 import asyncio
+import copy
 import json
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-from datetime import datetime
-import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
 import os
 import sys
 from pathlib import Path
+from base_agent import BaseAgent, agent_ticket_data
+from completion import CompletionLog
+from concurrency import AdaptiveConcurrencyController, AdaptiveSemaphore
+from plugins import get_agent_class
+from routing import RoutingTable
+from task_store import Task, TaskStatus, TaskStore
+from ticket_index import TicketIndex, get_index
+from ticket_stream import agent_update_type, append_update, read_ticket
+from validation import TicketValidator
 
-@dataclass
-class Task:
-    ticket_id: str
-    agent_type: str
-    priority: int
-    dependencies: List[str]
-    estimated_duration: int  # minutes
-    status: str = "pending"
-    assigned_agent: Optional[str] = None
-    start_time: Optional[datetime] = None
-    completion_time: Optional[datetime] = None
+# Agent scripts, relative to the repository root
+AGENT_SCRIPTS = {
+    "content": "agents/content-parser/content_agent.py",
+    "development": "agents/operator/development_agent.py",
+    "asset": "agents/asset-manager/asset_agent.py",
+    "qa": "agents/qa-validator/qa_agent.py",
+    "infrastructure": "agents/infrastructure/infrastructure_agent.py"
+}
+
+# Concurrent tasks per routed agent type; other routed types get default_pool_limit
+POOL_LIMITS = {
+    "development": 3,
+    "qa": 4
+}
+
+# How an agent type runs: "auto" uses a registered plugin agent in-process when
+# there is one and the agent script otherwise; "subprocess" always isolates it
+AGENT_MODES = ("auto", "inprocess", "subprocess")
 
 class AsyncTaskDispatcher:
-    def __init__(self):
-        self.task_queue = asyncio.Queue()
-        self.active_tasks: Dict[str, Task] = {}
+    def __init__(self, routing_rules_path: Optional[str] = None,
+                 validator: Optional[TicketValidator] = None,
+                 pool_bounds: Optional[Dict[str, Tuple[int, int]]] = None,
+                 max_queue_size: int = 0, history_limit: int = 1000,
+                 completion_log_path: Optional[str] = None,
+                 batch_sizes: Optional[Dict[str, int]] = None,
+                 agent_modes: Optional[Dict[str, str]] = None,
+                 ticket_index: Optional[TicketIndex] = None,
+                 pool_limits: Optional[Dict[str, int]] = None,
+                 default_pool_limit: int = 2):
+        # With max_queue_size > 0 producers wait for room in the ready queue, and the
+        # dispatch loop stops pulling from it while that many tasks are already spawned
+        self.task_queue = asyncio.Queue(maxsize=max_queue_size)
+        self.dispatch_slots = asyncio.Semaphore(max_queue_size) if max_queue_size else None
+        self.active_tasks = TaskStore()
+        self.routing = RoutingTable.load(routing_rules_path)
+        # One pool per agent type the routing rules produce
+        self.default_pool_limit = default_pool_limit
+        limits = {**POOL_LIMITS, **(pool_limits or {})}
         self.agent_pools = {
-            "react-components": asyncio.Semaphore(3),  # Max 3 concurrent React tasks
-            "ai-integration": asyncio.Semaphore(2),
-            "animation": asyncio.Semaphore(2),
-            "testing": asyncio.Semaphore(4),
-            "deployment": asyncio.Semaphore(2)
+            agent_type: AdaptiveSemaphore(limits.get(agent_type, default_pool_limit))
+            for agent_type in self.routing.agent_types
         }
-        self.completed_tasks = []
+        for name in sorted(set(pool_limits or {}) | set(pool_bounds or {})):
+            if name not in self.agent_pools:
+                print(f"Warning: pool {name} configured, but no routing rule produces that agent type")
+        # Pool limits are resized at runtime between the configured (min, max) bounds
+        self.concurrency = AdaptiveConcurrencyController(self.agent_pools, pool_bounds)
+        self.running_tasks = set()
+        # Finished tasks are folded into bitsets/counters; only recent records stay in memory
+        self.completions = CompletionLog(completion_log_path, history_limit)
+        self.completed_tasks = self.completions.recent
         self.blocked_tasks = []
         self.base_path = Path(__file__).parent
+        self.validator = validator or TicketValidator()
+        self.ticket_index = ticket_index if ticket_index is not None else get_index(Path("active/development"))
+        # Agent type -> max tickets per agent process; ready tasks of these types
+        # are grouped into one batched agent run (see BaseAgent.run_batch)
+        self.batch_sizes = batch_sizes or {}
+        # Agent type -> one of AGENT_MODES (default "auto")
+        self.agent_modes = agent_modes or {}
+        for agent_type, mode in self.agent_modes.items():
+            if mode not in AGENT_MODES:
+                raise ValueError(f"Unknown mode for agent {agent_type}: {mode}")
+        self.plugin_agents: Dict[str, Optional[BaseAgent]] = {}
+        # Parsed ticket data shared with in-process agents while a ticket has tasks
+        self.ticket_cache: Dict[str, dict] = {}
 
-    async def add_ticket_to_queue(self, ticket_xml_path: str):
+    async def add_ticket_to_queue(self, ticket_xml_path: str, validate: bool = True):
         """Parse ticket XML and create tasks for each agent type needed"""
-        ticket = self.parse_ticket_xml(ticket_xml_path)
+        # Reject malformed tickets before they reach any agent (callers that
+        # already ran validate_paths pass validate=False)
+        if validate:
+            self.validator.check(ticket_xml_path)
         
+        # One parse serves routing and any in-process agents
+        parsed = read_ticket(ticket_xml_path, include_progress=False)
+        ticket = self.ticket_summary(parsed)
+        self.ticket_index.add(ticket["id"], ticket_xml_path, save=False)
+        
+        await self.enqueue_ticket(ticket, agent_ticket_data(parsed))
+
+    async def enqueue_ticket(self, ticket: dict, ticket_data: Optional[dict] = None):
+        """Create tasks for parsed ticket data and queue them"""
         # Create tasks based on ticket requirements
         tasks = self.create_tasks_from_ticket(ticket)
         
+        if ticket_data is not None and any(self.plugin_agent(task.agent_type) for task in tasks):
+            self.ticket_cache[tasks[0].ticket_id] = ticket_data
+        
         for task in tasks:
+            self.completions.schedule(task.ticket_id, task.agent_type)
+            self.active_tasks.add(task)
             await self.task_queue.put(task)
-            self.active_tasks[f"{task.ticket_id}_{task.agent_type}"] = task
 
     def create_tasks_from_ticket(self, ticket_data: dict) -> List[Task]:
         """Analyze ticket and create appropriate tasks for different agents"""
@@ -53,133 +117,287 @@ class AsyncTaskDispatcher:
         # Get tags and type
         tags = ticket_data.get("tags", [])
         ticket_type = ticket_data.get("type", "development")
+        priority = self.get_priority_score(ticket_data["priority"])
         
-        # Content tasks - create for content-related tickets or if content tag exists
-        if "content" in tags or any(tag in ["content", "lesson", "educational"] for tag in tags):
-            tasks.append(Task(
-                ticket_id=ticket_data["id"],
-                agent_type="content",
-                priority=self.get_priority_score(ticket_data["priority"]),
-                dependencies=[],
-                estimated_duration=120  # 2 hours
-            ))
-        
-        # Development tasks - create for development tickets or if development tag exists
-        if "development" in tags or ticket_type == "development" or any(tag in ["development", "code", "bug", "feature"] for tag in tags):
-            tasks.append(Task(
-                ticket_id=ticket_data["id"],
-                agent_type="development",
-                priority=self.get_priority_score(ticket_data["priority"]),
-                dependencies=["content"] if "content" in [t.agent_type for t in tasks] else [],
-                estimated_duration=180
-            ))
-        
-        # Asset tasks - create for asset-related tickets or if asset tag exists
-        if "assets" in tags or any(tag in ["assets", "images", "qr", "media"] for tag in tags):
-            tasks.append(Task(
-                ticket_id=ticket_data["id"],
-                agent_type="asset",
-                priority=self.get_priority_score(ticket_data["priority"]),
-                dependencies=["content"] if "content" in [t.agent_type for t in tasks] else [],
-                estimated_duration=60
-            ))
-        
-        # QA tasks - create for QA-related tickets or if qa tag exists
-        if "qa" in tags or any(tag in ["qa", "testing", "validation"] for tag in tags):
-            tasks.append(Task(
-                ticket_id=ticket_data["id"],
-                agent_type="qa",
-                priority=self.get_priority_score(ticket_data["priority"]),
-                dependencies=["development", "asset"] if any(t.agent_type in ["development", "asset"] for t in tasks) else [],
-                estimated_duration=90
-            ))
-        
-        # Infrastructure tasks - create for infrastructure-related tickets or if infrastructure tag exists
-        if "infrastructure" in tags or any(tag in ["infrastructure", "deployment", "r2", "github-actions"] for tag in tags):
+        # Routing rules are compiled at startup, see config/routing-rules.json
+        for rule, dependencies in self.routing.route(tags, ticket_type):
             tasks.append(Task(
                 ticket_id=ticket_data["id"],
-                agent_type="infrastructure",
-                priority=self.get_priority_score(ticket_data["priority"]),
-                dependencies=["qa"] if "qa" in [t.agent_type for t in tasks] else [],
-                estimated_duration=240
-            ))
-        
-        # If no tasks were created, create a default development task for development tickets
-        if not tasks and ticket_type == "development":
-            tasks.append(Task(
-                ticket_id=ticket_data["id"],
-                agent_type="development",
-                priority=self.get_priority_score(ticket_data["priority"]),
-                dependencies=[],
-                estimated_duration=180
+                agent_type=rule.agent_type,
+                priority=priority,
+                dependencies=dependencies,
+                estimated_duration=rule.estimated_duration
             ))
         
         return tasks
 
+    def get_agent_pool(self, agent_type: str) -> AdaptiveSemaphore:
+        """Get the pool for an agent type, creating one with the default limit"""
+        if agent_type not in self.agent_pools:
+            print(f"Warning: no pool for agent type {agent_type}, using default limit {self.default_pool_limit}")
+            self.agent_pools[agent_type] = AdaptiveSemaphore(self.default_pool_limit)
+            self.concurrency.track(agent_type)
+        return self.agent_pools[agent_type]
+
     async def dispatch_tasks(self):
         """Main dispatch loop - runs continuously"""
+        controller = asyncio.create_task(self.concurrency.run())
+        
         while True:
+            # Tasks taken from the queue that still hold a dispatch slot
+            claimed: List[Task] = []
             try:
+                if self.dispatch_slots:
+                    await self.dispatch_slots.acquire()
+                
                 # Get next task from queue
                 task = await self.task_queue.get()
+                claimed.append(task)
                 
                 # Check if dependencies are met
-                if self.check_dependencies(task):
-                    # Acquire agent pool semaphore
-                    async with self.agent_pools[task.agent_type]:
-                        await self.execute_task(task)
+                if not self.check_dependencies(task):
+                    self.block_task(task)
+                elif self.batch_sizes.get(task.agent_type, 1) > 1 and not self.plugin_agent(task.agent_type):
+                    self.start_batch(await self.collect_batch(claimed))
                 else:
-                    # Move to blocked queue
-                    self.blocked_tasks.append(task)
+                    running = self.start_task(task)
+                    if self.dispatch_slots:
+                        running.add_done_callback(lambda _: self.dispatch_slots.release())
+                claimed = []
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 print(f"Error in dispatch loop: {e}")
+                self.abandon_tasks(claimed, e)
+        
+        controller.cancel()
+        # Keep results from tickets validated one at a time by add_ticket_to_queue
+        self.validator.save_cache()
+        for running in list(self.running_tasks):
+            running.cancel()
+
+    def abandon_tasks(self, tasks: List[Task], error: Exception):
+        """Fail tasks the dispatch loop could not start and give back their dispatch slots"""
+        for task in tasks:
+            self.fail_task(task, error)
+            if self.dispatch_slots:
+                self.dispatch_slots.release()
+
+    def block_task(self, task: Task):
+        """Park a task until its dependencies complete, or skip it if one failed"""
+        if self.completions.dependencies_failed(task.ticket_id, task.dependency_mask):
+            self.skip_task(task)
+        else:
+            self.blocked_tasks.append(task)
+        if self.dispatch_slots:
+            self.dispatch_slots.release()
+
+    async def collect_batch(self, batch: List[Task]) -> List[Task]:
+        """Drain already-queued ready tasks of the same agent type into a batch.
+
+        The batch starts with its first task and is extended in place; a
+        drained task stays in it until it is blocked or started, so the dispatch
+        loop knows which tasks hold a slot if collecting fails. Only tasks
+        that are in the queue right now are taken, so a batch never waits for
+        more work. Other ready tasks drained along the way are started on their
+        own; tasks with unmet dependencies are blocked as usual.
+        """
+        first = batch[0]
+        limit = self.batch_sizes[first.agent_type]
+        while len(batch) < limit and not self.task_queue.empty():
+            if self.dispatch_slots:
+                if self.dispatch_slots.locked():
+                    break
+                await self.dispatch_slots.acquire()
+            task = self.task_queue.get_nowait()
+            batch.append(task)
+            if not self.check_dependencies(task):
+                self.block_task(task)
+                batch.pop()
+            elif task.agent_type != first.agent_type:
+                running = self.start_task(task)
+                if self.dispatch_slots:
+                    running.add_done_callback(lambda _: self.dispatch_slots.release())
+                batch.pop()
+        return batch
+
+    def start_batch(self, batch: List[Task]) -> asyncio.Task:
+        """Run a batch of same-type tasks concurrently with other work"""
+        if len(batch) == 1:
+            running = self.start_task(batch[0])
+        else:
+            running = asyncio.create_task(self.run_batch(batch))
+            self.running_tasks.add(running)
+            running.add_done_callback(self.running_tasks.discard)
+        if self.dispatch_slots:
+            running.add_done_callback(lambda _: [self.dispatch_slots.release() for _ in batch])
+        return running
+
+    def start_task(self, task: Task) -> asyncio.Task:
+        """Run a task concurrently; its agent pool bounds how many run at once"""
+        running = asyncio.create_task(self.run_task(task))
+        self.running_tasks.add(running)
+        running.add_done_callback(self.running_tasks.discard)
+        return running
+
+    async def run_task(self, task: Task):
+        """Execute a task inside its agent pool and report the outcome to the controller"""
+        async with self.get_agent_pool(task.agent_type):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            agent_result = await self.execute_task(task)
+            failed = task.status == TaskStatus.FAILED or (agent_result or {}).get("status") == "failed"
+            self.concurrency.record(task.agent_type, loop.time() - started, failed)
+
+    async def run_batch(self, batch: List[Task]):
+        """Execute a batch in one slot of its agent pool, reporting each task to the controller"""
+        agent_type = batch[0].agent_type
+        async with self.get_agent_pool(agent_type):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            agent_results = await self.execute_batch(batch)
+            # Latency is per ticket so batched and single runs stay comparable
+            latency = (loop.time() - started) / len(batch)
+            for task, agent_result in zip(batch, agent_results):
+                failed = task.status == TaskStatus.FAILED or (agent_result or {}).get("status") == "failed"
+                self.concurrency.record(agent_type, latency, failed)
 
     async def execute_task(self, task: Task):
         """Execute a single task with the appropriate agent"""
-        task.status = "in_progress"
-        task.start_time = datetime.now()
-        
-        print(f"Starting task: {task.ticket_id} ({task.agent_type})")
+        self.mark_started(task)
         
         try:
             # Call the appropriate agent
             agent_result = await self.call_agent(task)
+            await self.finish_task(task, agent_result)
+            return agent_result
             
-            task.status = "completed"
-            task.completion_time = datetime.now()
-            self.completed_tasks.append(task)
-            
-            # Remove from active tasks
-            task_key = f"{task.ticket_id}_{task.agent_type}"
-            if task_key in self.active_tasks:
-                del self.active_tasks[task_key]
-            
-            # Update ticket status
-            await self.update_ticket_status(task.ticket_id, agent_result)
-            
-            print(f"Completed task: {task.ticket_id} ({task.agent_type})")
-            
-            # Check if blocked tasks can now proceed
-            await self.check_blocked_tasks()
-            
         except Exception as e:
-            task.status = "failed"
-            print(f"Task {task.ticket_id} failed: {e}")
+            self.fail_task(task, e)
+
+    async def execute_batch(self, batch: List[Task]) -> List[Optional[dict]]:
+        """Execute same-type tasks with a single agent run"""
+        for task in batch:
+            self.mark_started(task)
+        
+        try:
+            agent_results = await self.call_agent_batch(batch)
+        except Exception as e:
+            for task in batch:
+                self.fail_task(task, e)
+            return [None] * len(batch)
+        
+        for task, agent_result in zip(batch, agent_results):
+            if agent_result is None:
+                self.fail_task(task, RuntimeError(f"No result from {task.agent_type} batch"))
+                continue
+            try:
+                await self.finish_task(task, agent_result)
+            except Exception as e:
+                self.fail_task(task, e)
+        return agent_results
+
+    def mark_started(self, task: Task):
+        task.status = TaskStatus.IN_PROGRESS
+        task.start_time = asyncio.get_running_loop().time()
+        print(f"Starting task: {task.ticket_id} ({task.agent_type})")
+
+    async def finish_task(self, task: Task, agent_result: dict):
+        """Record an agent's result: failed if the agent reported failure, completed otherwise"""
+        if agent_result.get("status") != "failed":
+            await self.complete_task(task, agent_result)
+            return
+        
+        output = agent_result.get("output")
+        error = output.get("error") if isinstance(output, dict) else None
+        self.fail_task(task, RuntimeError(error or f"Agent {task.agent_type} reported failure"), agent_result)
+        
+        # The failure is still reported on the ticket
+        await self.update_ticket_status(task.ticket_id, agent_result)
+
+    async def complete_task(self, task: Task, agent_result: dict):
+        """Record a finished task, update its ticket and release dependants"""
+        task.status = TaskStatus.COMPLETED
+        task.completion_time = asyncio.get_running_loop().time()
+        self.completions.record(task, agent_result)
+        self.forget_ticket(task.ticket_id)
+        
+        # Remove from active tasks
+        self.active_tasks.remove(task.handle)
+        
+        # Update ticket status
+        await self.update_ticket_status(task.ticket_id, agent_result)
+        
+        print(f"Completed task: {task.ticket_id} ({task.agent_type})")
+        
+        # Check if blocked tasks can now proceed
+        await self.check_blocked_tasks()
+
+    def fail_task(self, task: Task, error: Exception, agent_result: Optional[dict] = None):
+        task.status = TaskStatus.FAILED
+        task.completion_time = asyncio.get_running_loop().time()
+        print(f"Task {task.ticket_id} failed: {error}")
+        
+        if self.active_tasks.remove(task.handle) is not None:
+            self.completions.record(task, agent_result)
+            self.forget_ticket(task.ticket_id)
+        
+        # Tasks waiting on this one can never run
+        self.release_blocked_tasks()
+
+    def skip_task(self, task: Task):
+        """Finish a task whose dependency failed without running it"""
+        task.status = TaskStatus.SKIPPED
+        task.completion_time = asyncio.get_running_loop().time()
+        print(f"Skipping task: {task.ticket_id} ({task.agent_type}), a dependency failed")
+        
+        if self.active_tasks.remove(task.handle) is not None:
+            self.completions.record(task)
+            self.forget_ticket(task.ticket_id)
+
+    def forget_ticket(self, ticket_id: str):
+        """Drop shared ticket data once the completion log has finished the ticket"""
+        if ticket_id not in self.completions.scheduled:
+            self.ticket_cache.pop(ticket_id, None)
+
+    def plugin_agent(self, agent_type: str) -> Optional[BaseAgent]:
+        """The in-process agent for an agent type, or None to run its script"""
+        if agent_type not in self.plugin_agents:
+            mode = self.agent_modes.get(agent_type, "auto")
+            agent_class = get_agent_class(agent_type) if mode != "subprocess" else None
+            if agent_class is None and mode == "inprocess":
+                raise ValueError(f"No plugin agent registered for: {agent_type}")
+            agent = agent_class() if agent_class else None
+            if agent is not None:
+                agent.ticket_cache = self.ticket_cache
+                agent.ticket_index = self.ticket_index
+            self.plugin_agents[agent_type] = agent
+        return self.plugin_agents[agent_type]
+
+    async def call_plugin_agent(self, agent: BaseAgent, task: Task) -> dict:
+        """Run a registered agent as a coroutine on this event loop"""
+        try:
+            # Per-task copy; loaded state and the ticket cache are shared
+            return await copy.copy(agent).process(task.ticket_id)
+        except Exception as e:
+            print(f"Agent {task.agent_type} failed: {e}")
+            return {
+                "agent_type": task.agent_type,
+                "ticket_id": task.ticket_id,
+                "status": "failed",
+                "output": {
+                    "error": str(e)
+                }
+            }
 
     async def call_agent(self, task: Task):
         """Call the appropriate agent based on task type"""
-        agent_map = {
-            "content": "agents/content-parser/content_agent.py",
-            "development": "agents/operator/development_agent.py",
-            "asset": "agents/asset-manager/asset_agent.py",
-            "qa": "agents/qa-validator/qa_agent.py",
-            "infrastructure": "agents/infrastructure/infrastructure_agent.py"
-        }
+        agent = self.plugin_agent(task.agent_type)
+        if agent is not None:
+            return await self.call_plugin_agent(agent, task)
         
-        agent_script = agent_map.get(task.agent_type)
+        agent_script = AGENT_SCRIPTS.get(task.agent_type)
         if not agent_script:
             raise ValueError(f"Unknown agent type: {task.agent_type}")
         
@@ -240,57 +458,83 @@ class AsyncTaskDispatcher:
                 }
             }
 
+    async def call_agent_batch(self, batch: List[Task]) -> List[Optional[dict]]:
+        """Run one agent process for a batch of tickets and collect its per-ticket result lines,
+        None for tickets the agent reported nothing for"""
+        agent_type = batch[0].agent_type
+        agent_script = AGENT_SCRIPTS.get(agent_type)
+        if not agent_script:
+            raise ValueError(f"Unknown agent type: {agent_type}")
+        
+        ticket_ids = [task.ticket_id for task in batch]
+        cmd = [sys.executable, agent_script, "--batch", *ticket_ids]
+        print(f"  Executing agent batch: {agent_script} ({len(batch)} tickets)")
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=Path(__file__).parent.parent.parent  # Set working directory to HTML/
+        )
+        stdout, stderr = await process.communicate()
+        
+        # BaseAgent.run_batch prints one JSON object per ticket as it finishes
+        results = {}
+        for line in stdout.decode().splitlines():
+            try:
+                agent_output = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(agent_output, dict) and agent_output.get("ticket_id") in ticket_ids:
+                results[agent_output["ticket_id"]] = agent_output
+        
+        if process.returncode != 0 or len(results) < len(ticket_ids):
+            error_msg = stderr.decode() if stderr else "Unknown error"
+            print(f"Agent {agent_type} batch failed (return code {process.returncode}): {error_msg}")
+        
+        return [results.get(ticket_id) for ticket_id in ticket_ids]
+
     def check_dependencies(self, task: Task) -> bool:
         """Check if all dependencies for a task are completed"""
-        for dep in task.dependencies:
-            # Check if dependency task is completed
-            completed_deps = [t for t in self.completed_tasks if t.agent_type == dep]
-            if not completed_deps:
-                return False
-        return True
+        return self.completions.dependencies_met(task.ticket_id, task.dependency_mask)
 
     async def check_blocked_tasks(self):
-        """Move unblocked tasks back to main queue"""
-        unblocked = []
-        for task in self.blocked_tasks:
-            if self.check_dependencies(task):
-                unblocked.append(task)
-                await self.task_queue.put(task)
-        
-        for task in unblocked:
-            self.blocked_tasks.remove(task)
+        """Start tasks whose dependencies are now met"""
+        self.release_blocked_tasks()
+
+    def release_blocked_tasks(self):
+        """Start blocked tasks whose dependencies are met and skip those whose dependencies failed"""
+        # Started tasks were already admitted from the queue, so they skip it
+        # (and its size limit) rather than waiting behind new tickets. Skipping
+        # a task can doom tasks that depend on it, so repeat until nothing changes.
+        changed = True
+        while changed:
+            changed = False
+            still_blocked = []
+            for task in self.blocked_tasks:
+                if self.check_dependencies(task):
+                    self.start_task(task)
+                elif self.completions.dependencies_failed(task.ticket_id, task.dependency_mask):
+                    self.skip_task(task)
+                    changed = True
+                else:
+                    still_blocked.append(task)
+            self.blocked_tasks[:] = still_blocked
 
     async def update_ticket_status(self, ticket_id: str, agent_result: dict):
         """Update ticket XML with agent results"""
         # Find the actual ticket file (filename may include title)
-        ticket_dir = Path("active/development")
-        ticket_files = list(ticket_dir.glob(f"{ticket_id}*.xml"))
+        ticket_path = self.ticket_index.lookup(ticket_id)
         
-        if not ticket_files:
+        if ticket_path is None:
             print(f"Ticket file not found for ID: {ticket_id}")
             return
         
-        ticket_path = ticket_files[0]  # Use the first matching file
-        
-        tree = ET.parse(ticket_path)
-        root = tree.getroot()
-        
-        # Add agent result to ticket
-        progress_elem = root.find(".//progress")
-        if progress_elem is None:
-            progress_elem = ET.SubElement(root, "progress")
-        
-        update_elem = ET.SubElement(progress_elem, "update")
-        update_elem.set("timestamp", datetime.now().isoformat())
-        update_elem.set("agent", agent_result.get("agent_type", "unknown"))
-        
-        status_elem = ET.SubElement(update_elem, "status")
-        status_elem.text = agent_result.get("status", "completed")
-        
-        result_elem = ET.SubElement(update_elem, "result")
-        result_elem.text = json.dumps(agent_result.get("output", {}))
-        
-        tree.write(ticket_path, encoding="UTF-8", xml_declaration=True)
+        # Agent results go to the communication log, where the schema allows them
+        status = agent_result.get("status", "completed")
+        append_update(ticket_path, agent_result.get("agent_type", "unknown"),
+                      f"{status}: {json.dumps(agent_result.get('output', {}))}",
+                      agent_update_type(status))
 
     def get_priority_score(self, priority: str) -> int:
         """Convert priority string to numeric score"""
@@ -305,51 +549,17 @@ class AsyncTaskDispatcher:
 
     def parse_ticket_xml(self, xml_path: str) -> dict:
         """Parse ticket XML and extract relevant data"""
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
-        # Try different namespaces
-        namespaces = [
-            {'ns': 'http://nsa.ca/ticket-system'},
-            {'ns': 'https://nsa-images.org/schemas/ticket/v1.0'},
-            {'ns0': 'https://nsa-images.org/schemas/ticket/v1.0'},
-            {}  # No namespace
-        ]
-        
-        for ns in namespaces:
-            try:
-                # Try to find elements with current namespace
-                if 'ns0' in ns:
-                    id_elem = root.find(".//ns0:id", ns)
-                    priority_elem = root.find(".//ns0:priority", ns)
-                    type_elem = root.find(".//ns0:type", ns)
-                    status_elem = root.find(".//ns0:status", ns)
-                    tags_elem = root.findall(".//ns0:tag", ns)
-                else:
-                    id_elem = root.find(".//ns:id", ns) if ns else root.find(".//id")
-                    priority_elem = root.find(".//ns:priority", ns) if ns else root.find(".//priority")
-                    type_elem = root.find(".//ns:type", ns) if ns else root.find(".//type")
-                    status_elem = root.find(".//ns:status", ns) if ns else root.find(".//status")
-                    tags_elem = root.findall(".//ns:tag", ns) if ns else root.findall(".//tag")
-                
-                if id_elem is not None:
-                    return {
-                        "id": id_elem.text,
-                        "priority": priority_elem.text if priority_elem is not None else "medium",
-                        "tags": [tag.text for tag in tags_elem],
-                        "type": type_elem.text if type_elem is not None else "development",
-                        "status": status_elem.text if status_elem is not None else "active"
-                    }
-            except Exception:
-                continue
-        
-        # If no namespace worked, try without namespace
+        # Headers only: streaming stops before the progress/communication history
+        return self.ticket_summary(read_ticket(xml_path, include_progress=False))
+
+    def ticket_summary(self, ticket: dict) -> dict:
+        """Fields routing needs, from a ticket_stream.read_ticket result"""
         return {
-            "id": root.find(".//id").text if root.find(".//id") is not None else "Unknown",
-            "priority": root.find(".//priority").text if root.find(".//priority") is not None else "medium",
-            "tags": [tag.text for tag in root.findall(".//tag")],
-            "type": root.find(".//type").text if root.find(".//type") is not None else "development",
-            "status": root.find(".//status").text if root.find(".//status") is not None else "active"
+            "id": ticket["id"] or "Unknown",
+            "priority": ticket["priority"] or "medium",
+            "tags": ticket["tags"],
+            "type": ticket["type"] or "development",
+            "status": ticket["status"] or "active"
         }
 
     def get_status_summary(self):
@@ -357,6 +567,8 @@ class AsyncTaskDispatcher:
         return {
             "active_tasks": len(self.active_tasks),
             "blocked_tasks": len(self.blocked_tasks),
-            "completed_tasks": len(self.completed_tasks),
-            "queue_size": self.task_queue.qsize()
+            "completed_tasks": self.completions.total("completed"),
+            "history": self.completions.summary(),
+            "queue_size": self.task_queue.qsize(),
+            "concurrency": self.concurrency.summary()
         }
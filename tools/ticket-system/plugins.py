@@ -0,0 +1,62 @@
+"""Registry of agents that run in-process in the dispatcher's event loop.
+
+Agents register with the decorator:
+
+    @register_agent("qa")
+    class QAAgent(BaseAgent):
+        ...
+
+or, from an installed package, through an entry point in the
+``ticket_system.agents`` group whose name is the agent type:
+
+    [project.entry-points."ticket_system.agents"]
+    qa = "my_agents.qa:QAAgent"
+
+Registered agents must not block: they share the dispatcher's event loop.
+"""
+from importlib import metadata
+from typing import Callable, Dict, Optional, Type
+
+ENTRY_POINT_GROUP = "ticket_system.agents"
+
+_registry: Dict[str, type] = {}
+_entry_points_loaded = False
+
+def register_agent(agent_type: str) -> Callable[[type], type]:
+    """Class decorator registering a BaseAgent subclass for an agent type"""
+    def decorator(cls: type) -> type:
+        _registry[agent_type] = cls
+        return cls
+    return decorator
+
+def load_entry_points():
+    """Register agents advertised by installed packages (once per process)"""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        entry_points = entry_points.select(group=ENTRY_POINT_GROUP)
+    else:  # Python < 3.10
+        entry_points = entry_points.get(ENTRY_POINT_GROUP, [])
+
+    for entry_point in entry_points:
+        # Agents registered in code win over installed ones
+        if entry_point.name in _registry:
+            continue
+        try:
+            _registry[entry_point.name] = entry_point.load()
+        except Exception as e:
+            print(f"Warning: could not load agent plugin {entry_point.name}: {e}")
+
+def get_agent_class(agent_type: str) -> Optional[Type]:
+    """Registered agent class for an agent type, if any"""
+    if agent_type not in _registry:
+        load_entry_points()
+    return _registry.get(agent_type)
+
+def registered_agents() -> Dict[str, type]:
+    load_entry_points()
+    return dict(_registry)
@@ -0,0 +1,93 @@
+import json
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from pathlib import Path
+
+from task_store import agent_types
+
+DEFAULT_RULES_PATH = Path(__file__).parent / "config" / "routing-rules.json"
+
+class CompiledRule(NamedTuple):
+    agent_type: str
+    agent_bit: int
+    dependencies: Tuple[str, ...]
+    dependency_mask: int
+    estimated_duration: int  # minutes
+
+class RoutingTable:
+    """Declarative tag/type routing compiled into bitmasks.
+
+    Each rule gets one bit in rule order. Every tag and ticket type maps to the
+    mask of rules it fires, so routing a ticket is a dict lookup per tag plus
+    one pass over the rules that actually fired.
+    """
+
+    def __init__(self, rules: List[dict], fallback: Optional[dict] = None):
+        self.rules: List[CompiledRule] = []
+        self.tag_masks: Dict[str, int] = {}
+        self.type_masks: Dict[str, int] = {}
+
+        for index, rule in enumerate(rules):
+            self.rules.append(self.compile_rule(rule))
+            rule_bit = 1 << index
+            for tag in rule.get("tags", []):
+                self.tag_masks[tag] = self.tag_masks.get(tag, 0) | rule_bit
+            for ticket_type in rule.get("types", []):
+                self.type_masks[ticket_type] = self.type_masks.get(ticket_type, 0) | rule_bit
+
+        self.fallback = self.compile_rule(fallback) if fallback else None
+        self.fallback_types = frozenset(fallback.get("types", [])) if fallback else frozenset()
+
+    @property
+    def agent_types(self) -> List[str]:
+        """Agent types the rules can route to, in rule order"""
+        routed = [rule.agent_type for rule in self.rules]
+        if self.fallback:
+            routed.append(self.fallback.agent_type)
+        return list(dict.fromkeys(routed))
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "RoutingTable":
+        """Load and compile a routing rules file"""
+        with open(path or DEFAULT_RULES_PATH, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config.get("rules", []), config.get("fallback"))
+
+    def compile_rule(self, rule: dict) -> CompiledRule:
+        """Resolve agent types in a rule to bits"""
+        dependencies = tuple(rule.get("depends_on", []))
+
+        return CompiledRule(
+            agent_type=rule["agent_type"],
+            agent_bit=agent_types.bit(rule["agent_type"]),
+            dependencies=dependencies,
+            dependency_mask=agent_types.mask(dependencies),
+            estimated_duration=rule.get("estimated_duration", 60)
+        )
+
+    def route(self, tags: List[str], ticket_type: str) -> List[Tuple[CompiledRule, List[str]]]:
+        """Return the fired rules for a ticket, in rule order, with resolved dependencies.
+
+        A rule's ``depends_on`` list is attached when any of those agents was
+        already scheduled for the same ticket by an earlier rule.
+        """
+        fired = self.type_masks.get(ticket_type, 0)
+        for tag in tags:
+            fired |= self.tag_masks.get(tag, 0)
+
+        routed = []
+        scheduled = 0
+        while fired:
+            lowest = fired & -fired
+            fired ^= lowest
+            rule = self.rules[lowest.bit_length() - 1]
+            if scheduled & rule.agent_bit:
+                continue
+
+            dependencies = list(rule.dependencies) if scheduled & rule.dependency_mask else []
+            scheduled |= rule.agent_bit
+            routed.append((rule, dependencies))
+
+        if not routed and self.fallback and ticket_type in self.fallback_types:
+            routed.append((self.fallback, []))
+
+        return routed
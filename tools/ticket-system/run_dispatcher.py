@@ -3,13 +3,16 @@ import sys
 import os
 from pathlib import Path
 from dispatcher import AsyncTaskDispatcher
+from validation import format_errors
 import time
 
 async def main():
     """Main dispatcher runner"""
     print("Starting Async Task Dispatcher...")
     
-    dispatcher = AsyncTaskDispatcher()
+    # Bounded ready queue: ticket ingestion waits while agents catch up
+    # Batching (batch_sizes) stays off until the agent scripts run through BaseAgent.main()
+    dispatcher = AsyncTaskDispatcher(max_queue_size=1000)
     
     # Add existing tickets to queue
     ticket_dir = Path("active/development")
@@ -18,25 +21,43 @@ async def main():
         print(f"Ticket directory not found: {ticket_dir}")
         return
     
+    ticket_files = [f for f in dispatcher.ticket_index.scan() if f.name != "README.md"]
+    
+    # Validate up front (in parallel for large directories) so bad tickets never get queued
+    rejected = 0
+    valid_files = []
+    for result in dispatcher.validator.validate_paths(ticket_files):
+        if result.valid:
+            valid_files.append(Path(result.path))
+        else:
+            rejected += 1
+            print(f"Rejected invalid ticket:\n{format_errors(result)}")
+    dispatcher.validator.save_cache()
+    
+    if rejected:
+        print(f"Rejected {rejected} invalid tickets")
+    
+    # Start dispatch loop first so a full queue drains while tickets are added
+    dispatch_task = asyncio.create_task(dispatcher.dispatch_tasks())
+    
     ticket_count = 0
-    for ticket_file in ticket_dir.glob("*.xml"):
-        if ticket_file.name != "README.md":
-            try:
-                await dispatcher.add_ticket_to_queue(str(ticket_file))
-                ticket_count += 1
-                print(f"Added ticket: {ticket_file.name}")
-            except Exception as e:
-                print(f"Error adding ticket {ticket_file.name}: {e}")
+    for ticket_file in valid_files:
+        try:
+            await dispatcher.add_ticket_to_queue(str(ticket_file), validate=False)
+            ticket_count += 1
+            print(f"Added ticket: {ticket_file.name}")
+        except Exception as e:
+            print(f"Error adding ticket {ticket_file.name}: {e}")
     
+    dispatcher.ticket_index.save()
     print(f"Added {ticket_count} tickets to queue")
     
     if ticket_count == 0:
         print("No tickets found. Exiting.")
+        dispatch_task.cancel()
+        await dispatch_task
         return
     
-    # Start dispatch loop
-    dispatch_task = asyncio.create_task(dispatcher.dispatch_tasks())
-    
     try:
         # Run until all tasks complete
         while True:
@@ -51,6 +72,9 @@ async def main():
                   f"Blocked: {summary['blocked_tasks']}, "
                   f"Completed: {summary['completed_tasks']}, "
                   f"Queue: {summary['queue_size']}")
+            for pool, state in summary['concurrency'].items():
+                if state['in_flight'] or state['decision'].startswith(("increase", "decrease")):
+                    print(f"  Pool {pool}: {state['in_flight']}/{state['limit']} ({state['decision']})")
             
             # Check if all work is done
             if (summary['active_tasks'] == 0 and 
@@ -0,0 +1,257 @@
+"""Discrete-event simulation of the dispatcher for tuning agent pool sizes.
+
+Runs the real AsyncTaskDispatcher scheduling and dependency logic on an event
+loop with a virtual clock: agents "run" for their estimated or historical
+duration without executing anything, so a day of dispatching simulates in a
+fraction of a second.
+
+    python simulation.py --synthetic 500 --pool development=2,4,8 --pool qa=2,4
+    python simulation.py --tickets active/development --history .cache/completed-tasks.jsonl
+"""
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import random
+import selectors
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dispatcher import AsyncTaskDispatcher
+from task_store import Task
+from ticket_index import scan_tickets
+from validation import TicketValidator
+
+class SimulationStalled(RuntimeError):
+    """Raised when no task can make progress (e.g. waiting on a failed dependency)"""
+
+class _VirtualTimeSelector(selectors.DefaultSelector):
+    """Selector that advances the loop's virtual clock instead of blocking"""
+
+    def __init__(self, loop: "VirtualClockLoop"):
+        super().__init__()
+        self.loop = loop
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events:
+            return events
+        if timeout is None:
+            raise SimulationStalled("No scheduled events left while work is pending")
+        self.loop.now += timeout
+        return events
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock jumps straight to the next scheduled callback"""
+
+    def __init__(self):
+        self.now = 0.0
+        super().__init__(selector=_VirtualTimeSelector(self))
+
+    def time(self) -> float:
+        return self.now
+
+def load_history(path) -> Dict[str, List[float]]:
+    """Observed durations (seconds) per agent type from the completion log"""
+    durations = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "completed" and record.get("start_time") and record.get("completion_time"):
+                durations[record["agent_type"]].append(record["completion_time"] - record["start_time"])
+    return dict(durations)
+
+def synthetic_corpus(dispatcher: AsyncTaskDispatcher, count: int, seed: int = 0) -> List[dict]:
+    """Random tickets drawn from the tags and types the routing rules know about"""
+    rng = random.Random(seed)
+    tags = sorted(dispatcher.routing.tag_masks)
+    types = sorted(dispatcher.routing.type_masks) + ["content", "asset", "qa"]
+    priorities = ["critical", "high", "medium", "low", "backlog"]
+    return [{
+        "id": f"SIM-{i:06d}",
+        "priority": rng.choice(priorities),
+        "tags": rng.sample(tags, rng.randint(1, 3)),
+        "type": rng.choice(types),
+        "status": "open"
+    } for i in range(count)]
+
+def load_corpus(dispatcher: AsyncTaskDispatcher, ticket_dir) -> List[dict]:
+    """Parse real tickets (headers only) from a ticket directory"""
+    tickets = []
+    for path in sorted(scan_tickets(ticket_dir)):
+        try:
+            tickets.append(dispatcher.parse_ticket_xml(str(path)))
+        except Exception as e:
+            print(f"Skipping {path.name}: {e}")
+    return tickets
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": values[-1]}
+
+class InMemoryTicketIndex:
+    """Ticket index stand-in that never reads or writes the ticket directory"""
+
+    def __init__(self):
+        self.paths: Dict[str, str] = {}
+
+    def add(self, ticket_id: str, path, save: bool = True):
+        self.paths[ticket_id] = str(path)
+
+    def lookup(self, ticket_id: str):
+        return None
+
+    def scan(self):
+        return iter(())
+
+    def save(self):
+        pass
+
+class SimulatedDispatcher(AsyncTaskDispatcher):
+    """Dispatcher whose agents sleep on the virtual clock instead of running.
+
+    Nothing is written to disk: the ticket index is in memory, the completion
+    log goes to os.devnull and the validator has no cache file.
+    """
+
+    def __init__(self, pool_limits: Dict[str, int], default_limit: int = 2,
+                 history: Optional[Dict[str, List[float]]] = None, seed: int = 0):
+        super().__init__(completion_log_path=os.devnull,
+                         validator=TicketValidator(cache_path=os.devnull),
+                         ticket_index=InMemoryTicketIndex(),
+                         pool_limits=pool_limits, default_pool_limit=default_limit)
+        # Fixed limits: the grid compares configurations, not the controller
+        self.concurrency.interval = None
+        self.history = history or {}
+        self.rng = random.Random(seed)
+        self.progress = asyncio.Event()
+        self.busy: Dict[str, float] = defaultdict(float)
+        self.pool_waits: Dict[str, List[float]] = defaultdict(list)
+        self.makespan = 0.0
+
+    def sample_duration(self, task: Task) -> float:
+        observed = self.history.get(task.agent_type)
+        if observed:
+            return self.rng.choice(observed)
+        return task.estimated_duration * 60.0
+
+    async def call_agent(self, task: Task):
+        await asyncio.sleep(self.sample_duration(task))
+        return {"agent_type": task.agent_type, "status": "completed", "output": {}}
+
+    async def update_ticket_status(self, ticket_id: str, agent_result: dict):
+        pass
+
+    async def run_task(self, task: Task):
+        ready = asyncio.get_running_loop().time()
+        await super().run_task(task)
+        self.pool_waits[task.agent_type].append(task.start_time - ready)
+        self.busy[task.agent_type] += task.completion_time - task.start_time
+        self.makespan = max(self.makespan, task.completion_time)
+        self.progress.set()
+
+    async def simulate(self, tickets: List[dict]):
+        dispatch = asyncio.create_task(self.dispatch_tasks())
+        for ticket in tickets:
+            await self.enqueue_ticket(ticket)
+        while self.active_tasks:
+            self.progress.clear()
+            await self.progress.wait()
+        dispatch.cancel()
+        # Cancelled before its first step if the corpus produced no tasks
+        with contextlib.suppress(asyncio.CancelledError):
+            await dispatch
+
+    def report(self) -> dict:
+        utilization = {}
+        for agent_type, busy in self.busy.items():
+            capacity = self.agent_pools[agent_type].limit * self.makespan
+            utilization[agent_type] = busy / capacity if capacity else 0.0
+        all_waits = [w for waits in self.pool_waits.values() for w in waits]
+        return {
+            "makespan": self.makespan,
+            "tasks": self.completions.total("completed"),
+            "utilization": utilization,
+            "pool_wait": percentiles(all_waits),
+            "pool_wait_by_agent": {a: percentiles(w) for a, w in self.pool_waits.items()}
+        }
+
+def run_simulation(tickets: List[dict], pool_limits: Dict[str, int], default_limit: int = 2,
+                   history: Optional[Dict[str, List[float]]] = None, seed: int = 0) -> dict:
+    """Simulate one pool configuration and return its report"""
+    loop = VirtualClockLoop()
+    started = time.process_time()
+    try:
+        asyncio.set_event_loop(loop)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            dispatcher = SimulatedDispatcher(pool_limits, default_limit, history, seed)
+            loop.run_until_complete(dispatcher.simulate(tickets))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    report = dispatcher.report()
+    report["pools"] = dict(pool_limits)
+    report["cpu_seconds"] = time.process_time() - started
+    return report
+
+def run_grid(tickets: List[dict], grid: Dict[str, List[int]], default_limit: int = 2,
+             history: Optional[Dict[str, List[float]]] = None, seed: int = 0) -> List[dict]:
+    """Simulate every combination of pool limits, best makespan first"""
+    names = sorted(grid)
+    reports = [
+        run_simulation(tickets, dict(zip(names, limits)), default_limit, history, seed)
+        for limits in itertools.product(*(grid[name] for name in names))
+    ]
+    return sorted(reports, key=lambda r: (r["makespan"], sum(r["pools"].values())))
+
+def format_hours(seconds: float) -> str:
+    return f"{seconds / 3600:.2f}h"
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate dispatcher pool configurations on a virtual clock")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--tickets", help="Directory of ticket XML files to use as the corpus")
+    source.add_argument("--synthetic", type=int, default=200, help="Number of synthetic tickets")
+    parser.add_argument("--pool", action="append", default=[], metavar="AGENT=N[,N...]",
+                        help="Pool limits to try for an agent type (repeatable)")
+    parser.add_argument("--default-limit", type=int, default=2, help="Limit for pools not in the grid or dispatcher.POOL_LIMITS")
+    parser.add_argument("--history", help="Completion log to sample durations from")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print full reports as JSON")
+    args = parser.parse_args()
+
+    grid = {}
+    for spec in args.pool:
+        agent_type, _, limits = spec.partition("=")
+        grid[agent_type] = [int(n) for n in limits.split(",") if n]
+
+    history = load_history(args.history) if args.history else None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        corpus_source = SimulatedDispatcher({})
+    tickets = (load_corpus(corpus_source, args.tickets) if args.tickets
+               else synthetic_corpus(corpus_source, args.synthetic, args.seed))
+
+    reports = run_grid(tickets, grid, args.default_limit, history, args.seed)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print(f"{len(tickets)} tickets, {len(reports)} configurations")
+        for report in reports:
+            pools = " ".join(f"{k}={v}" for k, v in report["pools"].items()) or "(defaults)"
+            wait = report["pool_wait"]
+            busiest = max(report["utilization"].items(), key=lambda kv: kv[1], default=("-", 0.0))
+            print(f"  {pools:40} makespan {format_hours(report['makespan']):>8}  "
+                  f"wait p50 {format_hours(wait['p50'])} p90 {format_hours(wait['p90'])}  "
+                  f"busiest {busiest[0]} {busiest[1]:.0%}  ({report['cpu_seconds']:.2f}s cpu)")
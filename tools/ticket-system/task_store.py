@@ -0,0 +1,132 @@
+import sys
+import time
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional
+
+class TaskStatus(str, Enum):
+    """Task states; members compare equal to their string values"""
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"  # never ran because a dependency failed
+
+    def __str__(self):
+        return self.value
+
+class AgentTypes:
+    """Process-wide intern table mapping agent type names to small ids.
+
+    An agent type's id doubles as its bit position, so sets of agent types
+    (dependencies, per-ticket completion) are plain ints.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def id(self, name: str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(sys.intern(name))
+        return self.ids[name]
+
+    def bit(self, name: str) -> int:
+        return 1 << self.id(name)
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bit(name)
+        return mask
+
+    def names_in(self, mask: int) -> List[str]:
+        names = []
+        while mask:
+            lowest = mask & -mask
+            names.append(self.names[lowest.bit_length() - 1])
+            mask ^= lowest
+        return names
+
+agent_types = AgentTypes()
+
+# Offset to convert monotonic task timestamps to wall-clock time for reports
+_WALL_CLOCK_OFFSET = time.time() - time.monotonic()
+
+def wall_clock(timestamp: Optional[float]) -> Optional[float]:
+    """Convert a monotonic timestamp to epoch seconds"""
+    return None if timestamp is None else timestamp + _WALL_CLOCK_OFFSET
+
+class Task:
+    """A unit of agent work for one ticket.
+
+    Slotted, with an interned ticket id, an agent type id, dependencies as an
+    agent-type bitmask and monotonic float timestamps, so large batches of
+    tasks stay small.
+    """
+
+    __slots__ = ("handle", "ticket_id", "agent_id", "priority", "dependency_mask",
+                 "estimated_duration", "status", "assigned_agent", "start_time", "completion_time")
+
+    def __init__(self, ticket_id: str, agent_type: str, priority: int, dependencies: Iterable[str],
+                 estimated_duration: int, status: TaskStatus = TaskStatus.PENDING,
+                 assigned_agent: Optional[str] = None, start_time: Optional[float] = None,
+                 completion_time: Optional[float] = None):
+        self.handle: Optional[int] = None
+        self.ticket_id = sys.intern(ticket_id)
+        self.agent_id = agent_types.id(agent_type)
+        self.priority = priority
+        self.dependency_mask = agent_types.mask(dependencies)
+        self.estimated_duration = estimated_duration  # minutes
+        self.status = status
+        self.assigned_agent = assigned_agent
+        self.start_time = start_time  # event loop clock (time.monotonic() by default)
+        self.completion_time = completion_time
+
+    @property
+    def agent_type(self) -> str:
+        return agent_types.names[self.agent_id]
+
+    @property
+    def agent_bit(self) -> int:
+        return 1 << self.agent_id
+
+    @property
+    def dependencies(self) -> List[str]:
+        return agent_types.names_in(self.dependency_mask)
+
+    def __repr__(self):
+        return (f"Task(ticket_id={self.ticket_id!r}, agent_type={self.agent_type!r}, "
+                f"priority={self.priority}, dependencies={self.dependencies!r}, "
+                f"status={self.status.value!r})")
+
+class TaskStore:
+    """Active tasks addressed by integer handle.
+
+    Handles are never reused, so a stale handle can't alias a newer task.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[int, Task] = {}
+        self.next_handle = 0
+
+    def add(self, task: Task) -> int:
+        task.handle = self.next_handle
+        self.next_handle += 1
+        self.tasks[task.handle] = task
+        return task.handle
+
+    def remove(self, handle: int) -> Optional[Task]:
+        return self.tasks.pop(handle, None)
+
+    def get(self, handle: int) -> Optional[Task]:
+        return self.tasks.get(handle)
+
+    def __contains__(self, handle: int) -> bool:
+        return handle in self.tasks
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.tasks.values())
@@ -0,0 +1,156 @@
+"""AdaptiveConcurrencyController and AdaptiveSemaphore behaviour, with host load mocked out.
+
+    python -m pytest test_concurrency.py
+"""
+import asyncio
+
+import pytest
+
+import concurrency
+from concurrency import AdaptiveConcurrencyController, AdaptiveSemaphore
+
+IDLE_HOST = {"load_per_cpu": 0.1, "mem_available": 0.8}
+
+class PendingWaiter:
+    """Stands in for a task blocked in AdaptiveSemaphore.acquire"""
+
+    def done(self):
+        return False
+
+    def set_result(self, result):
+        pass
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def host(monkeypatch):
+    load = dict(IDLE_HOST)
+    monkeypatch.setattr(concurrency, "read_host_load", lambda: dict(load))
+    return load
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def make_controller(clock, limit=8, bounds=(1, 16), **kwargs):
+    pool = AdaptiveSemaphore(limit)
+    controller = AdaptiveConcurrencyController({"qa": pool}, {"qa": bounds}, interval=None,
+                                               clock=clock, **kwargs)
+    return controller, pool
+
+def test_saturated_pool_grows_by_one(host, clock):
+    controller, pool = make_controller(clock, limit=2)
+    pool.in_flight = 2
+    pool._waiters.append(PendingWaiter())
+
+    controller.adjust()
+
+    assert pool.limit == 3
+    assert controller.stats["qa"].decision == "increase: saturated"
+
+def test_idle_pool_holds(host, clock):
+    controller, pool = make_controller(clock)
+    controller.record("qa", 1.0, failed=False)
+
+    controller.adjust()
+
+    assert pool.limit == 8
+    assert controller.stats["qa"].decision == "hold"
+
+def test_failures_decrease_multiplicatively(host, clock):
+    controller, pool = make_controller(clock)
+    for _ in range(5):
+        controller.record("qa", 1.0, failed=True)
+
+    controller.adjust()
+
+    assert pool.limit == 6
+    assert controller.stats["qa"].decision.startswith("decrease: failure rate")
+
+def test_no_decrease_without_new_samples(host, clock):
+    controller, pool = make_controller(clock)
+    for _ in range(5):
+        controller.record("qa", 1.0, failed=True)
+    controller.adjust()
+    clock.now += 60
+
+    # The failure rate is still high, but nothing finished since the last step
+    controller.adjust()
+
+    assert pool.limit == 6
+
+def test_cooldown_after_decrease(host, clock):
+    controller, pool = make_controller(clock, decrease_cooldown=30.0)
+    for _ in range(5):
+        controller.record("qa", 1.0, failed=True)
+    controller.adjust()
+
+    clock.now += 10
+    controller.record("qa", 1.0, failed=True)
+    controller.adjust()
+    assert pool.limit == 6
+    assert controller.stats["qa"].decision.startswith("hold: cooldown")
+
+    clock.now += 30
+    controller.record("qa", 1.0, failed=True)
+    controller.adjust()
+    assert pool.limit == 4
+
+def test_one_fast_run_does_not_pin_the_pool(host, clock):
+    controller, pool = make_controller(clock, limit=4, baseline_window=10)
+    stats = controller.stats["qa"]
+    controller.record("qa", 0.1, failed=False)
+
+    # Steady, saturated pool whose tasks all take 5s: the single 0.1s run
+    # may cost one decrease, but then ages out of the baseline window
+    for _ in range(30):
+        pool.in_flight = pool.limit
+        pool._waiters.append(PendingWaiter())
+        controller.record("qa", 5.0, failed=False)
+        controller.adjust()
+        pool._waiters.clear()
+        clock.now += 5
+
+    assert stats.baseline_latency > 1.0
+    assert pool.limit > 4
+    assert stats.decision == "increase: saturated"
+
+def test_latency_drift_decreases(host, clock):
+    controller, pool = make_controller(clock)
+    for _ in range(10):
+        controller.record("qa", 1.0, failed=False)
+    for _ in range(10):
+        controller.record("qa", 10.0, failed=False)
+
+    controller.adjust()
+
+    assert pool.limit == 6
+    assert controller.stats["qa"].decision.startswith("decrease: latency")
+
+def test_host_overload_respects_min_limit(host, clock):
+    controller, pool = make_controller(clock, limit=2, bounds=(2, 16), decrease_cooldown=0.0)
+    host["load_per_cpu"] = 4.0
+
+    controller.adjust()
+
+    assert pool.limit == 2
+    assert controller.stats["qa"].decision.startswith("decrease: host load")
+
+def test_resize_wakes_waiters():
+    async def scenario():
+        pool = AdaptiveSemaphore(1)
+        await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        assert pool.waiting == 1
+
+        pool.resize(2)
+        await asyncio.wait_for(waiter, timeout=1)
+        return pool.in_flight
+
+    assert asyncio.run(scenario()) == 2
@@ -0,0 +1,127 @@
+"""AsyncTaskDispatcher outcomes: failed agents, skipped dependants, dispatch capacity.
+
+    python -m pytest test_dispatcher.py
+"""
+import asyncio
+import os
+
+import pytest
+
+from dispatcher import AsyncTaskDispatcher
+from task_store import TaskStatus
+from ticket_index import TicketIndex
+from validation import TicketValidator
+
+# Routed to a content task and a development task that depends on it
+TICKET = {"id": "NSA-2025-001", "priority": "high", "tags": ["lesson", "code"],
+          "type": "content", "status": "open"}
+
+def agent_result(task, status):
+    output = {"error": "agent crashed", "return_code": 1} if status == "failed" else {}
+    return {"agent_type": task.agent_type, "ticket_id": task.ticket_id, "status": status, "output": output}
+
+def make_dispatcher(tmp_path, **kwargs):
+    return AsyncTaskDispatcher(completion_log_path=os.devnull, validator=TicketValidator(cache_path=os.devnull),
+                               ticket_index=TicketIndex(tmp_path), **kwargs)
+
+@pytest.fixture
+def dispatcher(tmp_path):
+    return make_dispatcher(tmp_path, max_queue_size=4)
+
+def run_tickets(dispatcher, tickets):
+    """Queue tickets (at most max_queue_size tasks), then dispatch until no task is active"""
+    async def scenario():
+        for ticket in tickets:
+            await dispatcher.enqueue_ticket(dict(ticket))
+        dispatch = asyncio.create_task(dispatcher.dispatch_tasks())
+        for _ in range(1000):
+            if not dispatcher.active_tasks:
+                break
+            await asyncio.sleep(0)
+        dispatch.cancel()
+        await asyncio.gather(dispatch, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+def stub_agents(dispatcher, statuses):
+    """Replace agent runs with results by agent type, recording the order they ran in"""
+    calls = []
+
+    async def call_agent(task):
+        calls.append(task.agent_type)
+        return agent_result(task, statuses.get(task.agent_type, "completed"))
+
+    dispatcher.call_agent = call_agent
+    return calls
+
+def test_completed_dependency_releases_dependant(dispatcher):
+    calls = stub_agents(dispatcher, {})
+
+    run_tickets(dispatcher, [TICKET])
+
+    assert calls == ["content", "development"]
+    assert dispatcher.completions.total("completed") == 2
+
+def test_failed_result_skips_dependant(dispatcher):
+    calls = stub_agents(dispatcher, {"content": "failed"})
+
+    run_tickets(dispatcher, [TICKET])
+
+    assert calls == ["content"]
+    assert dispatcher.completions.total("failed") == 1
+    assert dispatcher.completions.total("skipped") == 1
+    assert dispatcher.completions.total("completed") == 0
+    assert not dispatcher.active_tasks and not dispatcher.blocked_tasks
+    assert dispatcher.completions.scheduled == {}
+    assert [record["status"] for record in dispatcher.completed_tasks] == [
+        TaskStatus.FAILED.value, TaskStatus.SKIPPED.value]
+
+def test_batch_failures_skip_dependants(dispatcher):
+    dispatcher.batch_sizes = {"content": 4}
+    calls = stub_agents(dispatcher, {})
+
+    async def call_agent_batch(batch):
+        calls.append([task.ticket_id for task in batch])
+        # An explicit failure (an exception in BaseAgent.process) and a missing result line
+        return [agent_result(batch[0], "failed"), None]
+
+    dispatcher.call_agent_batch = call_agent_batch
+
+    run_tickets(dispatcher, [TICKET, dict(TICKET, id="NSA-2025-002")])
+
+    assert calls == [["NSA-2025-001", "NSA-2025-002"]]
+    assert dispatcher.completions.total("failed") == 2
+    assert dispatcher.completions.total("skipped") == 2
+    assert dispatcher.completions.total("completed") == 0
+    assert not dispatcher.active_tasks and not dispatcher.blocked_tasks
+
+def test_pools_follow_routed_agent_types(tmp_path):
+    dispatcher = make_dispatcher(tmp_path, pool_limits={"asset": 5}, pool_bounds={"qa": (2, 6)})
+
+    assert list(dispatcher.agent_pools) == ["content", "development", "asset", "qa", "infrastructure"]
+    assert dispatcher.agent_pools["asset"].limit == 5
+    assert dispatcher.agent_pools["qa"].limit == 4
+    assert dispatcher.agent_pools["content"].limit == dispatcher.default_pool_limit
+    assert dispatcher.concurrency.summary()["qa"]["bounds"] == [2, 6]
+
+def test_unrouted_pool_names_are_reported(tmp_path, capsys):
+    dispatcher = make_dispatcher(tmp_path, pool_bounds={"testing": (1, 8)})
+    assert "pool testing configured" in capsys.readouterr().out
+    assert "testing" not in dispatcher.agent_pools
+
+    dispatcher.get_agent_pool("review")
+    assert "no pool for agent type review" in capsys.readouterr().out
+
+def test_dispatch_error_fails_task_and_frees_its_slot(dispatcher):
+    # In-process mode without a registered plugin makes the batch branch raise
+    dispatcher.batch_sizes = {"content": 2}
+    dispatcher.agent_modes = {"content": "inprocess"}
+    stub_agents(dispatcher, {})
+
+    run_tickets(dispatcher, [TICKET, dict(TICKET, id="NSA-2025-002")])
+
+    assert dispatcher.completions.total("failed") == 2
+    assert dispatcher.completions.total("skipped") == 2
+    assert not dispatcher.active_tasks and not dispatcher.blocked_tasks
+    # Only the slot the idle loop holds while waiting for the next task is taken
+    assert dispatcher.dispatch_slots._value == 3
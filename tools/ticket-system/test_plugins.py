@@ -0,0 +1,72 @@
+"""In-process plugin agents run through the dispatcher and write to the ticket it indexed.
+
+    python -m pytest test_plugins.py
+"""
+import asyncio
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import plugins
+from base_agent import BaseAgent
+from dispatcher import AsyncTaskDispatcher
+from task_store import Task, TaskStatus
+from ticket_index import TicketIndex
+from ticket_stream import read_ticket
+from validation import TicketValidator
+
+TEMPLATE = Path(__file__).parent / "templates" / "asset-ticket.xml"
+TICKET_ID = "NSA-2025-023"
+
+class ReviewAgent(BaseAgent):
+    def __init__(self):
+        super().__init__("qa")
+
+    async def process_ticket(self, ticket_data):
+        self.update_ticket_progress("in-progress", f"Reviewing {ticket_data['title']}")
+        return {"reviewed": ticket_data["id"]}
+
+class CrashingAgent(ReviewAgent):
+    async def process_ticket(self, ticket_data):
+        raise RuntimeError("plugin crashed")
+
+@pytest.fixture
+def ticket_path(tmp_path):
+    path = tmp_path / f"{TICKET_ID}-asset.xml"
+    shutil.copy(TEMPLATE, path)
+    return path
+
+@pytest.fixture
+def dispatcher(ticket_path, monkeypatch):
+    monkeypatch.setitem(plugins._registry, "qa", ReviewAgent)
+    validator = TicketValidator(cache_path=os.devnull)
+    return AsyncTaskDispatcher(completion_log_path=os.devnull, validator=validator,
+                               ticket_index=TicketIndex(ticket_path.parent))
+
+def test_plugin_progress_updates_the_ticket_file(dispatcher, ticket_path):
+    task = Task(TICKET_ID, "qa", 1, [], 90)
+
+    result = asyncio.run(dispatcher.call_agent(task))
+
+    assert result["status"] == "completed"
+    assert result["output"] == {"reviewed": TICKET_ID}
+    updates = [update for update in read_ticket(ticket_path)["progress"] if update["agent"] == "qa"]
+    assert len(updates) == 1
+    assert updates[0]["details"].startswith("in-progress: Reviewing")
+    assert dispatcher.validator.validate_file(ticket_path).valid
+
+def test_crashing_plugin_fails_its_task(dispatcher, ticket_path, monkeypatch):
+    monkeypatch.setitem(plugins._registry, "qa", CrashingAgent)
+    task = Task(TICKET_ID, "qa", 1, [], 90)
+    dispatcher.active_tasks.add(task)
+
+    result = asyncio.run(dispatcher.execute_task(task))
+
+    assert result["status"] == "failed"
+    assert task.status == TaskStatus.FAILED
+    assert dispatcher.completions.total("failed") == 1
+    assert dispatcher.completions.total("completed") == 0
+    updates = [update for update in read_ticket(ticket_path)["progress"] if update["agent"] == "qa"]
+    assert [update["status"] for update in updates] == ["blocker"]
@@ -0,0 +1,70 @@
+"""Routing rules must reproduce the hard-coded routing they replaced.
+
+    python -m pytest test_routing.py
+"""
+import random
+
+import pytest
+
+from routing import RoutingTable
+
+TAG_POOL = ["content", "lesson", "educational", "development", "code", "bug", "feature",
+            "assets", "images", "qr", "media", "qa", "testing", "validation",
+            "infrastructure", "deployment", "r2", "github-actions", "docs", "urgent", ""]
+TYPE_POOL = ["development", "content", "asset", "qa", "infrastructure", "bug", "unknown"]
+
+def legacy_route(tags, ticket_type):
+    """AsyncTaskDispatcher.create_tasks_from_ticket before the rules file, as
+    (agent_type, dependencies, estimated_duration) tuples"""
+    tasks = []
+    scheduled = lambda: [t[0] for t in tasks]
+
+    if "content" in tags or any(tag in ["content", "lesson", "educational"] for tag in tags):
+        tasks.append(("content", [], 120))
+    if "development" in tags or ticket_type == "development" or any(tag in ["development", "code", "bug", "feature"] for tag in tags):
+        tasks.append(("development", ["content"] if "content" in scheduled() else [], 180))
+    if "assets" in tags or any(tag in ["assets", "images", "qr", "media"] for tag in tags):
+        tasks.append(("asset", ["content"] if "content" in scheduled() else [], 60))
+    if "qa" in tags or any(tag in ["qa", "testing", "validation"] for tag in tags):
+        tasks.append(("qa", ["development", "asset"] if any(a in ["development", "asset"] for a in scheduled()) else [], 90))
+    if "infrastructure" in tags or any(tag in ["infrastructure", "deployment", "r2", "github-actions"] for tag in tags):
+        tasks.append(("infrastructure", ["qa"] if "qa" in scheduled() else [], 240))
+    if not tasks and ticket_type == "development":
+        tasks.append(("development", [], 180))
+    return tasks
+
+def route(table, tags, ticket_type):
+    return [(rule.agent_type, dependencies, rule.estimated_duration)
+            for rule, dependencies in table.route(tags, ticket_type)]
+
+def corpus(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        tags = rng.sample(TAG_POOL, rng.randint(0, 5))
+        if rng.random() < 0.2 and tags:
+            tags.append(rng.choice(tags))  # duplicate tags
+        yield tags, rng.choice(TYPE_POOL)
+
+@pytest.fixture(scope="module")
+def table():
+    return RoutingTable.load()
+
+@pytest.mark.parametrize("tags, ticket_type", [
+    ([], "development"),
+    ([], "content"),
+    (["content"], "content"),
+    (["lesson", "qr"], "content"),
+    (["qa"], "asset"),
+    (["qa", "code"], "bug"),
+    (["r2"], "infrastructure"),
+    (["r2", "testing"], "infrastructure"),
+    (["educational", "feature", "media", "validation", "deployment"], "development"),
+    (["docs", "urgent"], "qa"),
+])
+def test_known_tickets_match_legacy_routing(table, tags, ticket_type):
+    assert route(table, tags, ticket_type) == legacy_route(tags, ticket_type)
+
+def test_random_corpus_matches_legacy_routing(table):
+    mismatches = [(tags, ticket_type) for tags, ticket_type in corpus(20000)
+                  if route(table, tags, ticket_type) != legacy_route(tags, ticket_type)]
+    assert mismatches == []
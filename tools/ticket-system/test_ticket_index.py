@@ -0,0 +1,56 @@
+"""TicketIndex layouts: migrating a directory into shards and finding tickets there.
+
+    python -m pytest test_ticket_index.py
+"""
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ticket_index import MANIFEST_NAME, TicketIndex, read_layout, scan_tickets
+
+TEMPLATE = Path(__file__).parent / "templates" / "asset-ticket.xml"
+TICKET_IDS = ["NSA-2024-007", "NSA-2025-001", "NSA-2025-013"]
+
+@pytest.fixture
+def ticket_dir(tmp_path):
+    for ticket_id in TICKET_IDS:
+        shutil.copy(TEMPLATE, tmp_path / f"{ticket_id}-asset.xml")
+    return tmp_path
+
+@pytest.mark.parametrize("layout", ["year", "hash"])
+def test_migrate_into_shards_and_back(ticket_dir, layout):
+    index = TicketIndex(ticket_dir)
+    assert index.migrate(layout) == 3
+
+    assert read_layout(ticket_dir) == layout
+    assert sorted(path.name for path in scan_tickets(ticket_dir)) == sorted(
+        f"{ticket_id}-asset.xml" for ticket_id in TICKET_IDS)
+    if layout == "year":
+        assert index.lookup("NSA-2024-007") == ticket_dir / "2024" / "NSA-2024-007-asset.xml"
+
+    # A fresh index follows the layout recorded in the manifest
+    assert TicketIndex(ticket_dir).lookup("NSA-2025-013") == index.lookup("NSA-2025-013")
+
+    assert index.migrate("flat") == 3
+    assert sorted(path.name for path in ticket_dir.iterdir() if path.is_dir()) == []
+    assert index.lookup("NSA-2025-001") == ticket_dir / "NSA-2025-001-asset.xml"
+
+def test_layout_is_inferred_without_a_manifest(ticket_dir):
+    TicketIndex(ticket_dir).migrate("year")
+    (ticket_dir / MANIFEST_NAME).unlink()
+
+    index = TicketIndex(ticket_dir)
+
+    assert index.layout == "year"
+    assert sorted(index.paths) == TICKET_IDS
+
+def test_interrupted_migration_can_be_rerun(ticket_dir):
+    # One ticket already moved, the manifest still says flat
+    index = TicketIndex(ticket_dir)
+    (ticket_dir / "2025").mkdir()
+    (ticket_dir / "NSA-2025-001-asset.xml").rename(ticket_dir / "2025" / "NSA-2025-001-asset.xml")
+
+    assert index.migrate("year") == 2
+    assert sorted(index.paths) == TICKET_IDS
+    assert all(index.lookup(ticket_id) for ticket_id in TICKET_IDS)
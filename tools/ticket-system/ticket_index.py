@@ -0,0 +1,295 @@
+"""Ticket id -> file path index for a ticket directory.
+
+A directory is either flat or sharded by year (NSA-2025-... -> 2025/) or by
+hash bucket (ab/). The layout is recorded in the directory's manifest, so
+every tool that opens the directory picks it up; change it with:
+
+    python ticket_index.py active/development               # show layout and size
+    python ticket_index.py active/development --layout year
+    python ticket_index.py active/development --layout flat
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from ticket_stream import read_ticket
+
+MANIFEST_NAME = ".ticket-index.json"
+
+# Directory layouts: everything in one directory, one directory per year
+# (NSA-2025-... -> 2025/), or 256 hash buckets (ab/)
+LAYOUTS = ("flat", "year", "hash")
+
+# Ticket ids embedded in file names, e.g. NSA-2025-001-some-title.xml
+TICKET_ID_PATTERN = re.compile(r"^([A-Z]+-(\d{4})-\d+)(?=[^0-9]|$)")
+
+# Shard directory names for the year and hash layouts
+SHARD_PATTERNS = {"year": re.compile(r"^(\d{4}|misc)$"), "hash": re.compile(r"^[0-9a-f]{2}$")}
+
+def read_layout(ticket_dir) -> str:
+    """Layout recorded in a ticket directory's manifest, or inferred from its contents"""
+    try:
+        with open(Path(ticket_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+            layout = json.load(f).get("layout")
+        if layout in LAYOUTS:
+            return layout
+    except (OSError, ValueError):
+        pass
+    return infer_layout(ticket_dir)
+
+def infer_layout(ticket_dir) -> str:
+    """Guess the layout of a directory without a manifest from where its ticket files are"""
+    ticket_dir = Path(ticket_dir)
+    if not ticket_dir.is_dir() or next(ticket_dir.glob("*.xml"), None) is not None:
+        return "flat"
+    shards = {path.parent.name for path in ticket_dir.glob("*/*.xml")}
+    for layout, pattern in SHARD_PATTERNS.items():
+        if shards and all(pattern.match(name) for name in shards):
+            return layout
+    return "flat"
+
+def scan_tickets(ticket_dir, layout: Optional[str] = None) -> Iterator[Path]:
+    """List the ticket files of a directory's layout without reading or writing its index"""
+    ticket_dir = Path(ticket_dir)
+    if not ticket_dir.exists():
+        return iter(())
+    pattern = "*.xml" if (layout or read_layout(ticket_dir)) == "flat" else "*/*.xml"
+    return ticket_dir.glob(pattern)
+
+class TicketIndex:
+    """Ticket id -> file path index backed by a manifest in the ticket directory.
+
+    Lookups are a dict access. The manifest is updated on create, rename and
+    delete; entries that point at a missing file are repaired by reloading the
+    manifest and, as a last resort, rescanning the directory. A rescan only
+    happens when the directory has changed since the last one, so repeated
+    misses (e.g. for archived tickets) cost a few stat calls.
+
+    The layout comes from the manifest (see migrate); a directory without one
+    gets the layout its files are in.
+    """
+
+    def __init__(self, ticket_dir):
+        self.ticket_dir = Path(ticket_dir)
+        self.layout = "flat"
+        self.manifest_path = self.ticket_dir / MANIFEST_NAME
+        self.paths: Dict[str, str] = {}  # id -> path relative to ticket_dir
+        self.manifest_mtime = None
+        self.scanned_stamp = None  # directory_stamp() as of the last rescan
+        self.dirty = False
+
+        if not self.load():
+            self.layout = infer_layout(self.ticket_dir)
+            self.rebuild()
+
+    def load(self) -> bool:
+        """Load the persisted manifest, returning False if there is none"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        self.layout = manifest.get("layout", self.layout)
+        self.paths = manifest.get("tickets", {})
+        self.manifest_mtime = mtime
+        return True
+
+    def save(self):
+        """Persist the manifest atomically"""
+        # Never create the ticket directory just to hold an index
+        if not self.dirty or not self.ticket_dir.exists():
+            return
+        # Our own write changes the directory; don't let it trigger a rescan
+        scanned = self.scanned_stamp is not None and self.scanned_stamp == self.directory_stamp()
+        # Agent processes share the directory, so each writer gets its own temp file
+        tmp_path = self.manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"layout": self.layout, "tickets": self.paths}, f, indent=0)
+        os.replace(tmp_path, self.manifest_path)
+        self.manifest_mtime = self.manifest_path.stat().st_mtime
+        if scanned:
+            self.scanned_stamp = self.directory_stamp()
+        self.dirty = False
+
+    def directory_stamp(self) -> Optional[tuple]:
+        """Modification times of the directories ticket files live in"""
+        try:
+            stamp = [self.ticket_dir.stat().st_mtime_ns]
+            if self.layout != "flat":
+                stamp.extend(entry.stat().st_mtime_ns for entry in os.scandir(self.ticket_dir)
+                             if entry.is_dir())
+        except OSError:
+            return None
+        return tuple(stamp)
+
+    def scan(self) -> Iterator[Path]:
+        """List ticket files on disk for the configured layout"""
+        return scan_tickets(self.ticket_dir, self.layout)
+
+    def rebuild(self):
+        """Rescan the ticket directory and rewrite the manifest"""
+        self.scanned_stamp = self.directory_stamp()
+        self.paths = {}
+        for path in self.scan():
+            ticket_id = self.ticket_id_for(path)
+            if ticket_id:
+                self.paths[ticket_id] = self.relative(path)
+        self.dirty = True
+        self.save()
+
+    def ticket_id_for(self, path: Path) -> Optional[str]:
+        """Get a ticket's id from its file name, falling back to its metadata"""
+        match = TICKET_ID_PATTERN.match(path.name)
+        if match:
+            return match.group(1)
+        try:
+            return read_ticket(path, include_progress=False, read_tags=False)["id"]
+        except Exception:
+            return None
+
+    def relative(self, path) -> str:
+        """Store paths relative to the ticket directory"""
+        path = Path(path)
+        try:
+            return path.relative_to(self.ticket_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def shard_dir(self, ticket_id: str) -> Path:
+        """Directory a ticket belongs in under the configured layout"""
+        if self.layout == "year":
+            match = TICKET_ID_PATTERN.match(ticket_id)
+            return self.ticket_dir / (match.group(2) if match else "misc")
+        if self.layout == "hash":
+            return self.ticket_dir / hashlib.sha1(ticket_id.encode("utf-8")).hexdigest()[:2]
+        return self.ticket_dir
+
+    def path_for_new(self, ticket_id: str, filename: Optional[str] = None) -> Path:
+        """Path where a new ticket should be created"""
+        return self.shard_dir(ticket_id) / (filename or f"{ticket_id}.xml")
+
+    def lookup(self, ticket_id: str) -> Optional[Path]:
+        """Find a ticket's file by exact id"""
+        path = self.resolve(ticket_id)
+        if path is not None:
+            return path
+
+        # Another process may have updated the manifest since we loaded it
+        try:
+            changed = self.manifest_path.stat().st_mtime != self.manifest_mtime
+        except OSError:
+            changed = True
+        if changed and self.load():
+            path = self.resolve(ticket_id)
+            if path is not None:
+                return path
+
+        # Rescan only if files were added, renamed or removed since the last rescan
+        if self.scanned_stamp is None or self.directory_stamp() != self.scanned_stamp:
+            self.rebuild()
+            return self.resolve(ticket_id)
+        return None
+
+    def resolve(self, ticket_id: str) -> Optional[Path]:
+        """Resolve an indexed id without touching the manifest"""
+        relative = self.paths.get(ticket_id)
+        if relative is None:
+            return None
+        path = self.ticket_dir / relative
+        return path if path.exists() else None
+
+    def add(self, ticket_id: str, path, save: bool = True):
+        """Record a newly created (or newly seen) ticket"""
+        relative = self.relative(path)
+        if self.paths.get(ticket_id) != relative:
+            self.paths[ticket_id] = relative
+            self.dirty = True
+        if save:
+            self.save()
+
+    def rename(self, ticket_id: str, new_path, save: bool = True):
+        """Move a ticket file and update its index entry"""
+        old_path = self.lookup(ticket_id)
+        if old_path is None:
+            raise FileNotFoundError(f"Ticket file not found for ID: {ticket_id}")
+        new_path = Path(new_path)
+        new_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(old_path, new_path)
+        self.add(ticket_id, new_path, save=save)
+
+    def migrate(self, layout: str) -> int:
+        """Move every ticket into the places of another layout, returning how many moved.
+
+        Files are collected from both the flat and the sharded places, so a
+        migration that was interrupted can simply be run again.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown ticket layout: {layout}")
+        self.paths = {}
+        for path in [*self.ticket_dir.glob("*.xml"), *self.ticket_dir.glob("*/*.xml")]:
+            ticket_id = self.ticket_id_for(path)
+            if ticket_id:
+                self.paths[ticket_id] = self.relative(path)
+
+        self.layout = layout
+        moved = 0
+        emptied = set()
+        for ticket_id, relative in sorted(self.paths.items()):
+            old_path = self.ticket_dir / relative
+            new_path = self.path_for_new(ticket_id, old_path.name)
+            if new_path != old_path:
+                self.rename(ticket_id, new_path, save=False)
+                emptied.add(old_path.parent)
+                moved += 1
+
+        for directory in emptied - {self.ticket_dir}:
+            try:
+                directory.rmdir()
+            except OSError:  # Not empty: holds files that are not tickets
+                pass
+        # Records the new layout in the manifest
+        self.rebuild()
+        return moved
+
+    def remove(self, ticket_id: str, delete_file: bool = False, save: bool = True):
+        """Drop a ticket from the index, optionally deleting its file"""
+        relative = self.paths.pop(ticket_id, None)
+        if relative is None:
+            return
+        if delete_file:
+            (self.ticket_dir / relative).unlink(missing_ok=True)
+        self.dirty = True
+        if save:
+            self.save()
+
+# One index per ticket directory per process
+_indexes: Dict[str, TicketIndex] = {}
+
+def get_index(ticket_dir) -> TicketIndex:
+    """Get the shared index for a ticket directory"""
+    key = str(Path(ticket_dir).resolve())
+    if key not in _indexes:
+        _indexes[key] = TicketIndex(ticket_dir)
+    return _indexes[key]
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show or change the layout of a ticket directory")
+    parser.add_argument("ticket_dir", nargs="?", default="active/development")
+    parser.add_argument("--layout", choices=LAYOUTS, help="Move every ticket into this layout")
+    args = parser.parse_args()
+
+    if not Path(args.ticket_dir).is_dir():
+        parser.exit(1, f"Ticket directory not found: {args.ticket_dir}\n")
+    index = TicketIndex(args.ticket_dir)
+    if args.layout:
+        previous = index.layout
+        moved = index.migrate(args.layout)
+        print(f"Moved {moved} tickets from the {previous} layout to {args.layout}")
+    print(f"{index.ticket_dir}: {index.layout} layout, {len(index.paths)} tickets")
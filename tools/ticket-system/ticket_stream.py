@@ -0,0 +1,230 @@
+import contextlib
+import os
+import re
+from datetime import datetime
+from typing import BinaryIO, List, Optional
+import xml.etree.ElementTree as ET
+
+# Scalar fields read from the first matching element outside the history sections
+HEADER_FIELDS = ("id", "title", "description", "type", "priority", "status", "assigned_to", "created")
+
+# Sections that only ever grow (agent updates, communication log)
+HISTORY_SECTIONS = frozenset(("progress", "communication"))
+
+REQUIREMENT_TYPES = ("functional", "technical", "non_functional")
+
+# The schema allows free-form elements (and so tags) only in the optional
+# team_specific section, which follows the history sections at the end of the file
+TEAM_SPECIFIC_START = re.compile(rb"<(?:[\w.-]+:)?team_specific[\s/>]")
+COMMUNICATION_END = re.compile(rb"</(?:[\w.-]+:)?communication\s*>")
+ROOT_START = re.compile(rb"<(?![?!])[^>]*>")
+TAIL_CHUNK = 64 * 1024
+
+# Updates live in communication/updates; progress/update is the legacy agent format
+UPDATE_PARENTS = frozenset(("updates", "progress"))
+
+# Agent result statuses -> the schema's UpdateTypeEnum
+AGENT_UPDATE_TYPES = {"completed": "completion", "failed": "blocker"}
+
+def local_name(tag: str) -> str:
+    """Strip any namespace from an element tag"""
+    return tag.rsplit("}", 1)[-1]
+
+def parse_timestamp(value: str) -> float:
+    """Parse an ISO timestamp the same way the dashboard does"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+def read_ticket(path, include_progress: bool = True, since: Optional[float] = None,
+                read_tags: bool = True) -> dict:
+    """Stream a ticket with iterparse, keeping memory bounded by element depth.
+
+    Elements are detached from their parent as soon as they end, so long
+    progress/communication histories are never held in memory. Namespaces are
+    ignored. Missing fields are returned as None so callers keep their own
+    defaults.
+
+    With ``include_progress=False`` parsing stops at the first history section;
+    tags, which can only follow the history, are then read by seeking to the
+    team_specific section from the end of the file (skipped with
+    ``read_tags=False``). Otherwise progress updates are collected, limited to
+    those newer than ``since`` (epoch seconds) when given.
+    """
+    ticket = {field: None for field in HEADER_FIELDS}
+    ticket.update({"tags": [], "dependencies": [], "requirements": {}, "progress": []})
+    stack = []
+    history_depth = 0
+
+    # Accept an open binary file too (e.g. a member of an archive pack)
+    with (open(path, "rb") if not hasattr(path, "read") else contextlib.nullcontext(path)) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            name = local_name(elem.tag)
+
+            if event == "start":
+                stack.append(elem)
+                if name in HISTORY_SECTIONS:
+                    if not include_progress:
+                        if read_tags:
+                            ticket["tags"].extend(read_trailing_tags(f))
+                        break
+                    history_depth += 1
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            parent_name = local_name(parent.tag) if parent is not None else None
+
+            if history_depth:
+                if name in HISTORY_SECTIONS:
+                    history_depth -= 1
+                elif include_progress and name == "update" and parent_name in UPDATE_PARENTS:
+                    update = progress_update(elem)
+                    if since is None or is_recent(update, since):
+                        ticket["progress"].append(update)
+            elif name in ticket and ticket[name] is None and name in HEADER_FIELDS:
+                ticket[name] = elem.text
+            elif name == "tag":
+                ticket["tags"].append(elem.text)
+            elif name == "dependency":
+                ticket["dependencies"].append({
+                    "id": elem.get("id"),
+                    "type": elem.get("type"),
+                    "description": elem.text
+                })
+            elif name == "requirement" and parent_name in REQUIREMENT_TYPES:
+                ticket["requirements"].setdefault(parent_name, []).append(elem.get("id"))
+
+            release(elem, parent, parent_name)
+
+    return ticket
+
+def find_team_specific(f: BinaryIO) -> Optional[int]:
+    """Offset of the team_specific section, searching back from the end of the file.
+
+    The search stops at </communication>, which the section must follow, so
+    only the tail of the file is read.
+    """
+    end = f.seek(0, os.SEEK_END)
+    position = end
+    tail = b""
+    while position > 0:
+        step = min(TAIL_CHUNK, position)
+        position -= step
+        f.seek(position)
+        tail = f.read(step) + tail
+        starts = list(TEAM_SPECIFIC_START.finditer(tail))
+        if starts:
+            return position + starts[-1].start()
+        if COMMUNICATION_END.search(tail):
+            return None
+    return None
+
+def read_trailing_tags(f: BinaryIO) -> List[str]:
+    """Tags inside team_specific, parsing only that section (and the root tag for namespaces)"""
+    try:
+        offset = find_team_specific(f)
+        if offset is None:
+            return []
+        f.seek(0)
+        root_start = ROOT_START.search(f.read(TAIL_CHUNK))
+        f.seek(offset)
+        # The section runs to the end of the file, including the root's end tag
+        fragment = ET.fromstring(root_start.group(0) + f.read())
+    except (OSError, ValueError, AttributeError, ET.ParseError):
+        return scan_tags(f)
+    return [elem.text for elem in fragment.iter() if local_name(elem.tag) == "tag"]
+
+def scan_tags(f: BinaryIO) -> List[str]:
+    """Fallback for files the tail read can't handle: stream the whole file for tags"""
+    tags = []
+    f.seek(0)
+    for _, elem in ET.iterparse(f):
+        if local_name(elem.tag) == "tag":
+            tags.append(elem.text)
+        elem.clear()
+    return tags
+
+def release(elem, parent, parent_name: Optional[str]):
+    """Free a finished element so the tree never grows beyond the current path.
+
+    Children of an <update> are kept until the update itself ends and is read.
+    """
+    if parent_name == "update":
+        return
+    # The element that just ended is always its parent's last child
+    if parent is not None and len(parent) and parent[-1] is elem:
+        del parent[-1]
+    elem.clear()
+
+def progress_update(elem) -> dict:
+    """Convert an <update> element to a dict"""
+    if len(elem) == 0:
+        # communication/updates/update: author and type attributes, text body
+        return {
+            "timestamp": elem.get("timestamp"),
+            "agent": elem.get("author"),
+            "status": elem.get("type", "status"),
+            "details": (elem.text or "").strip() or None
+        }
+    update = {
+        "timestamp": elem.get("timestamp"),
+        "agent": elem.get("agent"),
+        "status": None,
+        "details": None
+    }
+    for child in elem:
+        child_name = local_name(child.tag)
+        if child_name in ("status", "details"):
+            update[child_name] = child.text
+    return update
+
+def is_recent(update: dict, since: float) -> bool:
+    """Check an update timestamp against a cutoff, dropping malformed timestamps"""
+    try:
+        return bool(update["timestamp"]) and parse_timestamp(update["timestamp"]) > since
+    except ValueError:
+        return False
+
+def agent_update_type(status: Optional[str]) -> str:
+    return AGENT_UPDATE_TYPES.get(status, "progress")
+
+def append_update(path, author: str, text: str, update_type: str = "progress"):
+    """Append an update to a ticket's communication log in the form the schema allows.
+
+    Agents used to write an un-namespaced <progress><update> block at the end of
+    the ticket, which the schema rejects; any such block is folded into the log.
+    """
+    tree = ET.parse(path)
+    root = tree.getroot()
+    namespace = root.tag[1:].split("}", 1)[0] if root.tag.startswith("{") else ""
+    qualify = lambda name: f"{{{namespace}}}{name}" if namespace else name
+    ET.register_namespace("", namespace)
+
+    communication = root.find(qualify("communication"))
+    if communication is None:
+        communication = ET.SubElement(root, qualify("communication"))
+    updates = communication.find(qualify("updates"))
+    if updates is None:
+        updates = ET.Element(qualify("updates"))
+        communication.insert(0, updates)
+
+    def add(timestamp: Optional[str], author: str, update_type: str, text: str):
+        update = ET.SubElement(updates, qualify("update"))
+        update.set("timestamp", timestamp or datetime.now().astimezone().isoformat())
+        update.set("author", author)
+        update.set("type", update_type)
+        update.text = text
+
+    # The schema's <progress> never holds <update>s; legacy blocks always do
+    legacy_blocks = [child for child in root if local_name(child.tag) == "progress"
+                     and any(local_name(update.tag) == "update" for update in child)]
+    for legacy in legacy_blocks:
+        for old in legacy:
+            fields = {local_name(child.tag): child.text for child in old}
+            status = fields.get("status")
+            details = fields.get("details") or fields.get("result") or ""
+            add(old.get("timestamp"), old.get("agent") or "unknown", agent_update_type(status),
+                f"{status}: {details}" if status else details)
+        root.remove(legacy)
+
+    add(None, author, update_type, text)
+    tree.write(path, encoding="UTF-8", xml_declaration=True)
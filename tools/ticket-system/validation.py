@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from lxml import etree
+except ImportError:  # XSD validation needs lxml; without it every ticket passes
+    etree = None
+
+DEFAULT_SCHEMA_PATH = Path(__file__).parent / "schemas" / "ticket-base.xsd"
+DEFAULT_CACHE_PATH = Path(__file__).parent / ".cache" / "validation-cache.json"
+
+# Compiled schema, built at most once per process (including pool workers)
+_schema = None
+_schema_path = None
+
+class TicketValidationError(Exception):
+    """Raised when a ticket does not conform to the ticket schema"""
+
+    def __init__(self, result: "ValidationResult"):
+        self.result = result
+        first = result.errors[0]["message"] if result.errors else "invalid ticket"
+        super().__init__(f"{result.path}: {first}")
+
+@dataclass
+class ValidationResult:
+    path: str
+    content_hash: str
+    valid: bool
+    errors: List[dict] = field(default_factory=list)
+    cached: bool = False
+
+def get_schema(schema_path: Path = DEFAULT_SCHEMA_PATH):
+    """Compile the XSD once per process and reuse it"""
+    global _schema, _schema_path
+    if _schema is None or _schema_path != str(schema_path):
+        _schema = etree.XMLSchema(etree.parse(str(schema_path)))
+        _schema_path = str(schema_path)
+    return _schema
+
+def _init_worker(schema_path: str):
+    """Process pool initializer: compile the schema in each worker up front"""
+    get_schema(Path(schema_path))
+
+def _validate_content(content: bytes, schema_path: str) -> List[dict]:
+    """Validate raw ticket bytes, returning a list of structured errors"""
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    try:
+        document = etree.fromstring(content, parser)
+    except etree.XMLSyntaxError as e:
+        return [{
+            "line": e.lineno,
+            "column": e.offset,
+            "message": e.msg,
+            "path": None,
+            "kind": "syntax"
+        }]
+
+    schema = get_schema(Path(schema_path))
+    if schema.validate(document):
+        return []
+
+    return [{
+        "line": entry.line,
+        "column": entry.column,
+        "message": entry.message,
+        "path": entry.path,
+        "kind": "schema"
+    } for entry in schema.error_log]
+
+def _validate_job(job):
+    """Pool entry point (must be module-level to be picklable)"""
+    content, schema_path = job
+    return _validate_content(content, schema_path)
+
+class TicketValidator:
+    """Validates tickets against the XSD with a content-hash result cache"""
+
+    def __init__(self, schema_path: Optional[Path] = None, cache_path: Optional[Path] = None,
+                 max_workers: Optional[int] = None, parallel_threshold: int = 32,
+                 max_cache_entries: int = 50000):
+        self.schema_path = Path(schema_path or DEFAULT_SCHEMA_PATH)
+        self.cache_path = Path(cache_path or DEFAULT_CACHE_PATH)
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self.max_cache_entries = max_cache_entries
+        self.available = etree is not None
+        self.schema_hash = self.hash_bytes(self.schema_path.read_bytes()) if self.schema_path.exists() else ""
+        self.cache: Dict[str, dict] = self.load_cache()
+        self.dirty = False
+
+        if not self.available:
+            print("Warning: lxml not installed, ticket schema validation is disabled")
+
+    def hash_bytes(self, content: bytes) -> str:
+        """Content hash used as the cache key"""
+        return hashlib.sha256(content).hexdigest()
+
+    def load_cache(self) -> Dict[str, dict]:
+        """Load cached results, discarding them if the schema changed"""
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get("schema_hash") != self.schema_hash:
+            return {}
+        return data.get("results", {})
+
+    def save_cache(self):
+        """Persist cached results atomically"""
+        if not self.dirty:
+            return
+
+        # Drop the oldest entries so the cache file stays bounded
+        overflow = len(self.cache) - self.max_cache_entries
+        if overflow > 0:
+            for key in list(self.cache)[:overflow]:
+                del self.cache[key]
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"schema_hash": self.schema_hash, "results": self.cache}, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+    def validate_file(self, path) -> ValidationResult:
+        """Validate a single ticket file"""
+        return self.validate_paths([path])[0]
+
+    def validate_paths(self, paths: Iterable) -> List[ValidationResult]:
+        """Validate many ticket files, in a process pool for large batches"""
+        results: List[Optional[ValidationResult]] = []
+        pending = []  # (index, content)
+
+        for path in paths:
+            content = Path(path).read_bytes()
+            content_hash = self.hash_bytes(content)
+
+            if not self.available:
+                results.append(ValidationResult(str(path), content_hash, True))
+                continue
+
+            cached = self.cache.get(content_hash)
+            if cached is not None:
+                results.append(ValidationResult(str(path), content_hash, cached["valid"],
+                                                cached["errors"], cached=True))
+            else:
+                pending.append((len(results), content))
+                results.append(ValidationResult(str(path), content_hash, False))
+
+        if pending:
+            jobs = [(content, str(self.schema_path)) for _, content in pending]
+            if len(pending) >= self.parallel_threshold:
+                with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                         initargs=(str(self.schema_path),)) as pool:
+                    outcomes = list(pool.map(_validate_job, jobs, chunksize=16))
+            else:
+                outcomes = [_validate_job(job) for job in jobs]
+
+            for (index, _), errors in zip(pending, outcomes):
+                result = results[index]
+                result.valid = not errors
+                result.errors = errors
+                self.cache[result.content_hash] = {"valid": result.valid, "errors": errors}
+                self.dirty = True
+
+        return results
+
+    def check(self, path) -> ValidationResult:
+        """Validate a ticket, raising TicketValidationError if it is invalid"""
+        result = self.validate_file(path)
+        if not result.valid:
+            raise TicketValidationError(result)
+        return result
+
+def format_errors(result: ValidationResult) -> str:
+    """Format structured validation errors for console output"""
+    lines = [f"{result.path}: {len(result.errors)} error(s)"]
+    for error in result.errors:
+        lines.append(f"  line {error['line']}, col {error['column']}: {error['message']}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from ticket_index import scan_tickets
+
+    parser = argparse.ArgumentParser(description="Validate ticket XML against the ticket schema")
+    parser.add_argument("paths", nargs="*", default=["active/development"], help="Ticket files or directories")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args()
+
+    files = []
+    for arg in args.paths:
+        path = Path(arg)
+        files.extend(sorted(scan_tickets(path)) if path.is_dir() else [path])
+
+    validator = TicketValidator()
+    results = validator.validate_paths(files)
+    validator.save_cache()
+
+    for result in results:
+        if args.json:
+            print(json.dumps(asdict(result)))
+        elif not result.valid:
+            print(format_errors(result))
+
+    invalid = sum(1 for r in results if not r.valid)
+    if not args.json:
+        print(f"Validated {len(results)} tickets, {invalid} invalid")
+    sys.exit(1 if invalid else 0)